@@ -0,0 +1,172 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.st_stub import stub_streamlit
+from scripts.generate_synthetic import synthetic_table
+from graphs import line_chart
+from services.filter_data_service import slice_data
+from services.indicator_service import HAPPINESS, INDICATORS
+from services.layer_cache_service import create_layer
+from services.load_data_service import prepare_dataset
+from services.set_scale_service import get_scale
+from services.snapshot_service import DATA_FILE, build_snapshot, read_table
+from views.indicator_page import display_base_map
+
+SCALES = (1, 10, 100, 1000)
+THRESHOLDS_FILE = "benchmarks/thresholds.json"
+# Floor for generated thresholds, so sub-millisecond stages don't flap
+MIN_THRESHOLD_MS = 5.0
+QUERY_YEARS = (2021, 2019, 2015)
+QUERY_REGIONS = ('All', 'Western Europe', 'Sub-Saharan Africa')
+TREND_COUNTRIES = ['Finland', 'Denmark', 'Iceland', 'Norway', 'Switzerland']
+# Synthetic tables are generated from a fixed seed so runs stay comparable
+SEED = 0
+
+
+def queries():
+    for indicator in INDICATORS.values():
+        start, end = indicator.slider_value
+        for year in QUERY_YEARS:
+            for region in QUERY_REGIONS:
+                yield indicator, year, region, start, end
+
+
+def run_load(paths):
+    csv_path, snapshot_path, version = paths
+    return prepare_dataset(read_table(csv_path, snapshot_path), version)
+
+
+def run_filter(dataset):
+    for indicator, year, region, start, end in queries():
+        slice_data(dataset, year, region, start, end, indicator.column)
+
+
+def run_scale(dataset):
+    for indicator, year, region, start, end in queries():
+        get_scale(dataset, year, region, start, end, indicator.column)
+
+
+def run_map(dataset):
+    for indicator in (HAPPINESS, INDICATORS['hdi']):
+        start, end = indicator.slider_value
+        for region in QUERY_REGIONS:
+            layer = create_layer(dataset, indicator, 2019, region, start, end)
+            display_base_map(layer, region).get_root().render()
+
+
+def run_chart(dataset):
+    # Cold spec builds: the shared spec cache is emptied first
+    line_chart.SPEC_CACHE.clear()
+    with stub_streamlit():
+        for indicator in (HAPPINESS, INDICATORS['hdi'], INDICATORS['gni']):
+            line_chart.display_past_data(dataset, TREND_COUNTRIES, 'Year', indicator.column, 'Country',
+                                         ['Country', indicator.column, indicator.rank_column],
+                                         indicator.trend_title)
+
+
+STAGES = {
+    'load': run_load,
+    'filter': run_filter,
+    'scale': run_scale,
+    'map': run_map,
+    'chart': run_chart,
+}
+
+
+def measure(stage, argument, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        STAGES[stage](argument)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    # Separate run for memory, since tracing slows the timed code down
+    tracemalloc.start()
+    STAGES[stage](argument)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'peak_kb': peak // 1024,
+    }
+
+
+def prepare_scale(base, factor, workdir):
+    # 1x is the shipped CSV; larger scales are synthetic tables of
+    # factor x as many rows, with sub-national units past the country count
+    csv_path = DATA_FILE
+    if factor > 1:
+        csv_path = os.path.join(workdir, f"data-{factor}x.csv")
+        synthetic_table(rows=len(base) * factor, seed=SEED).to_csv(csv_path, index=False)
+    snapshot_path = os.path.join(workdir, f"data-{factor}x.feather")
+    build_snapshot(csv_path, snapshot_path)
+    return csv_path, snapshot_path, f"bench-{factor}x"
+
+
+def check(results, thresholds):
+    regressions = []
+    for result in results:
+        limit = thresholds.get(result['stage'], {}).get(str(result['scale']))
+        if limit is not None and result['median_ms'] > limit:
+            regressions.append({**result, 'threshold_ms': limit})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time load, filter, scale, map and chart paths without a server")
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--thresholds', default=THRESHOLDS_FILE)
+    parser.add_argument('--write-thresholds', type=float, metavar='FACTOR',
+                        help="write FACTOR x the measured medians as the new thresholds")
+    parser.add_argument('--out', help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    base = read_table()
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for factor in args.scales:
+            paths = prepare_scale(base, factor, workdir)
+            dataset = run_load(paths)
+            for stage in args.stages:
+                argument = paths if stage == 'load' else dataset
+                result = {'stage': stage, 'scale': factor, 'rows': len(dataset)}
+                result.update(measure(stage, argument, args.repeat))
+                results.append(result)
+                print(f"{stage:<8}{factor:>6}x{result['median_ms']:>12.1f} ms{result['peak_kb']:>10} KB",
+                      file=sys.stderr)
+
+    if args.write_thresholds:
+        thresholds = {}
+        for result in results:
+            thresholds.setdefault(result['stage'], {})[str(result['scale'])] = \
+                round(max(result['median_ms'] * args.write_thresholds, MIN_THRESHOLD_MS), 1)
+        with open(args.thresholds, 'w') as f:
+            json.dump(thresholds, f, indent=2)
+            f.write('\n')
+
+    thresholds = {}
+    if os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    report = {'results': results, 'regressions': check(results, thresholds)}
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    sys.exit(1 if report['regressions'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import time
+
+import streamlit as st
+
+from benchmarks.streamlit_context import attach_script_context
+from services.dataset_service import Dataset
+from services.filter_data_service import filter_data, slice_data
+from services.snapshot_service import read_table
+from tests.helpers import scaled
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+@st.cache_data
+def filter_frame(df, year, region, start, end, entity_name):
+    # The previous signature: st.cache_data hashes every row of df per call
+    return slice_data(Dataset(df, ''), year, region, start, end, entity_name)
+
+
+def hit_latency(call, repeat):
+    call()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache hit latency: hashed DataFrame vs versioned dataset")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    attach_script_context()
+    base = read_table()
+    query = (2019, 'Western Europe', 1, 8, 'Happiness Score')
+
+    print(f"{'rows':>10}{'DataFrame key ms':>18}{'version key ms':>16}{'speedup':>10}")
+    for rows in SIZES:
+        df = scaled(base, rows)
+        dataset = Dataset(df, f"bench-{rows}")
+        frame_s = hit_latency(lambda: filter_frame(df, *query), args.repeat)
+        dataset_s = hit_latency(lambda: filter_data(dataset, *query), args.repeat)
+        print(f"{rows:>10}{frame_s * 1000:>18.3f}{dataset_s * 1000:>16.3f}{frame_s / dataset_s:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import random
+
+from graphs import line_chart
+from services.cache_service import LRUCache
+from services.dataset_service import Dataset
+from services.indicator_service import HAPPINESS, INDICATORS
+from services.snapshot_service import read_table
+
+CACHE_SIZES = (64, 256, 1024)
+
+
+def selections(countries, requests, popular, seed):
+    # Most analysts look at a few popular sets; the rest pick at random
+    rng = random.Random(seed)
+    common = [rng.sample(countries, rng.randint(1, 5)) for _ in range(popular)]
+    for _ in range(requests):
+        if rng.random() < 0.8:
+            yield rng.choice(common)
+        else:
+            yield rng.sample(countries, rng.randint(1, 5))
+
+
+def replay(dataset, cache_size, requests, popular, seed):
+    line_chart.SPEC_CACHE = LRUCache(cache_size)
+    countries = sorted(dataset.df['Country'].astype(str).unique())
+    indicators = list(INDICATORS.values())
+    rng = random.Random(seed)
+    for selected in selections(countries, requests, popular, seed):
+        indicator = rng.choice(indicators)
+        for shown in {indicator, HAPPINESS}:
+            line_chart.past_data_spec(dataset, selected, 'Year', shown.column, 'Country',
+                                      ['Country', shown.column, shown.rank_column], shown.trend_title)
+    return line_chart.past_data_cache_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trend chart spec cache hit rate by cache size")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--popular', type=int, default=20, help="number of frequently viewed selections")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = Dataset(read_table(), 'bench')
+    print(f"{'max entries':>12}{'entries':>9}{'hit rate':>10}{'mean build ms':>15}")
+    for size in CACHE_SIZES:
+        stats = replay(dataset, size, args.requests, args.popular, args.seed)
+        print(f"{size:>12}{stats['entries']:>9}{stats['hit_rate']:>10.1%}{stats['mean_build_ms']:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
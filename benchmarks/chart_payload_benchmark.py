@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+
+import altair as alt
+
+from graphs.chart_spec import MAX_BYTES_PER_VALUE
+from graphs.line_chart import line_chart, line_chart_data
+from services.indicator_service import HAPPINESS, INDICATORS
+from services.snapshot_service import read_table
+
+COUNTRIES = ['Finland', 'Denmark', 'Iceland', 'Norway', 'Switzerland', 'Netherlands', 'Sweden', 'Germany']
+
+
+def spec_bytes(chart):
+    spec = chart.to_dict()
+    data = [row for rows in spec.get('datasets', {}).values() for row in rows]
+    return len(json.dumps(spec)), len(json.dumps(data)), data
+
+
+def full_frame_chart(df, countries, indicator):
+    # The previous display_past_data: every column of the selected rows
+    return alt.Chart(df[df['Country'].isin(countries)]).mark_line(point=True).encode(
+        x='Year', y=indicator.column, color='Country',
+        tooltip=['Country', indicator.column, indicator.rank_column])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vega-Lite payload of the trend line charts")
+    parser.add_argument('--countries', type=int, default=len(COUNTRIES))
+    args = parser.parse_args()
+
+    df = read_table()
+    countries = COUNTRIES[:args.countries]
+    failures = []
+    print(f"{'indicator':<22}{'full KB':>9}{'long KB':>9}{'wide KB':>9}{'bytes/value':>13}")
+    for indicator in (HAPPINESS, *[i for i in INDICATORS.values() if i != HAPPINESS]):
+        tooltip = ['Country', indicator.column, indicator.rank_column]
+        full, _, _ = spec_bytes(full_frame_chart(df, countries, indicator))
+        sizes = {}
+        for wide in (False, True):
+            data = line_chart_data(df, countries, 'Year', indicator.column, 'Country', tooltip, wide)
+            chart = line_chart(data, 'Year', indicator.column, 'Country', tooltip, indicator.trend_title, wide)
+            sizes[wide] = spec_bytes(chart)
+
+        _, data_bytes, rows = sizes[False]
+        plotted = {'Year', 'Country', indicator.column, indicator.rank_column}
+        values = sum(len(row) for row in rows)
+        if any(set(row) - plotted for row in rows):
+            failures.append(f"{indicator.key}: payload carries unplotted columns")
+        if data_bytes > MAX_BYTES_PER_VALUE * values:
+            failures.append(f"{indicator.key}: {data_bytes} bytes for {values} values")
+        print(f"{indicator.key:<22}{full / 1024:>9.1f}{sizes[False][0] / 1024:>9.1f}"
+              f"{sizes[True][0] / 1024:>9.1f}{data_bytes / values:>13.1f}")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
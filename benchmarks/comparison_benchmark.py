@@ -0,0 +1,82 @@
+import argparse
+import statistics
+import time
+
+from services.comparison_service import compare_slice
+from services.indicator_service import INDICATORS, YEARS
+from services.layer_cache_service import build_layer, build_values, level_features, trend_values
+from services.load_data_service import prepare_dataset, table_version
+from services.region_service import region_zoom
+from services.filter_data_service import slice_data
+from services.set_scale_service import get_scale
+from services.snapshot_service import read_table
+from views.comparison_map import display_comparison
+from views.indicator_page import display_base_map
+
+REGIONS = ('All', 'Western Europe', 'Southern Asia')
+
+
+def separate_values(dataset, year, region, render=False):
+    # Each indicator page's map for the selection, built from scratch and
+    # optionally rendered as the document st_folium sends
+    size = 0
+    for indicator in INDICATORS.values():
+        start, end = indicator.slider_value
+        df = slice_data(dataset, year, region, start, end, indicator.column)
+        if df.empty:
+            continue
+        scale = get_scale(dataset, year, region, start, end, indicator.column)
+        trend = trend_values(dataset, indicator, year)
+        if render:
+            layer = build_layer(df, scale, indicator, region_zoom(region), trend)
+            size += len(display_base_map(layer, region).get_root().render())
+        else:
+            build_values(df, scale, indicator, trend)
+    return size
+
+
+def separate_pages(dataset, year, region):
+    return separate_values(dataset, year, region, render=True)
+
+
+def comparison_values(dataset, year, region):
+    compare_slice(dataset, year, region)
+    return 0
+
+
+def comparison_page(dataset, year, region):
+    layers = [layer for layer in compare_slice(dataset, year, region).values() if layer is not None]
+    return len(display_comparison(layers, level_features(region_zoom(region)), region).render())
+
+
+def measure(build, dataset, repeat):
+    times = []
+    sizes = []
+    for region in REGIONS:
+        for year in YEARS:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                sizes.append(build(dataset, year, region))
+                times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), statistics.median(sizes) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="One comparison page vs every indicator page for the same selection")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    dataset = prepare_dataset(read_table(), table_version())
+    # Outlines are parsed once per level by either path; keep that out of the timings
+    for region in REGIONS:
+        level_features(region_zoom(region))
+    print(f"{'':<24}{'median ms':>11}{'median KB':>11}")
+    builds = (('separate values', separate_values), ('comparison values', comparison_values),
+              ('separate pages', separate_pages), ('comparison page', comparison_page))
+    for name, build in builds:
+        ms, kb = measure(build, dataset, args.repeat)
+        print(f"{name:<24}{ms:>11.1f}{kb:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import time
+
+import geopandas as gpd
+import shapely
+
+from services.geometry_service import GEOJSON_FILE, build_geometry_cache, level_path, read_level
+from services.region_service import ZOOM_LEVELS
+from services.snapshot_service import file_digest
+
+
+def timed(loader, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = loader()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def describe(level, geo_data, load_s, file_bytes):
+    return {
+        'level': level,
+        'file_bytes': file_bytes,
+        'payload_bytes': len(geo_data.to_json().encode()),
+        'vertices': int(shapely.get_num_coordinates(geo_data.geometry.values).sum()),
+        'load_ms': round(load_s * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload size and load time per geometry level")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    digest = file_digest(GEOJSON_FILE)
+    if any(read_level(level_path(zoom), digest) is None for zoom in ZOOM_LEVELS):
+        build_geometry_cache()
+
+    source, load_s = timed(lambda: gpd.read_file(GEOJSON_FILE), args.repeat)
+    results = [describe('source', source, load_s, os.path.getsize(GEOJSON_FILE))]
+    for zoom in ZOOM_LEVELS:
+        path = level_path(zoom)
+        geo_data, load_s = timed(lambda: read_level(path, digest), args.repeat)
+        results.append(describe(f"z{zoom}", geo_data, load_s, os.path.getsize(path)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'level':<8}{'file B':>10}{'payload B':>12}{'vertices':>10}{'load ms':>10}")
+    for r in results:
+        print(f"{r['level']:<8}{r['file_bytes']:>10}{r['payload_bytes']:>12}{r['vertices']:>10}{r['load_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+PAGES = ['home.py'] + sorted(glob.glob('pages/*.py'))
+HEAVY_MODULES = ('geopandas', 'shapely', 'pyogrio', 'fiona', 'folium', 'streamlit_folium',
+                 'branca', 'altair', 'plotly', 'pyarrow')
+# No warm-up or file watcher in the child: only the page's own work is timed,
+# and no background thread can hold up interpreter exit
+CHILD_ENV = {'PYTHONWARNINGS': 'ignore', 'DASHBOARD_WARMUP': '0', 'DASHBOARD_RELOAD_INTERVAL': '0'}
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def child(page):
+    # Runs in a fresh interpreter started with -X importtime
+    start = time.perf_counter()
+    import runpy
+    from benchmarks.streamlit_context import attach_script_context
+    attach_script_context()
+    module = runpy.run_path(page, run_name='benchmark')
+    imported = time.perf_counter()
+    module['main']()
+    rendered = time.perf_counter()
+    print(json.dumps({
+        'import_ms': round((imported - start) * 1000, 1),
+        'first_render_ms': round((rendered - start) * 1000, 1),
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+
+def top_level_imports(stderr, count):
+    # -X importtime lines: self us | cumulative us | nested module name
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            imports.append((int(match.group(2)) / 1000, match.group(4)))
+    return [{'module': name, 'ms': round(ms, 1)} for ms, name in sorted(imports, reverse=True)[:count]]
+
+
+def measure(page, top, timeout):
+    try:
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'benchmarks.import_benchmark',
+                                  '--child', page], capture_output=True, text=True,
+                                 env={**os.environ, **CHILD_ENV}, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'page': page, 'error': f"timed out after {timeout} s"}
+    if process.returncode != 0:
+        return {'page': page, 'error': f"exited with {process.returncode}:\n{process.stderr[-2000:]}"}
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result['page'] = page
+    result['slowest_imports'] = top_level_imports(process.stderr, top)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import and time-to-first-render per page")
+    parser.add_argument('pages', nargs='*', default=PAGES)
+    parser.add_argument('--top', type=int, default=5, help="slowest top-level imports to report")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds before a page counts as failed")
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    results = [measure(page, args.top, args.timeout) for page in args.pages]
+    failed = [r for r in results if 'error' in r]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        sys.exit(1 if failed else 0)
+    for r in results:
+        if 'error' in r:
+            print(f"{r['page']:<50}FAILED: {r['error']}")
+            continue
+        print(f"{r['page']:<50}{r['import_ms']:>10} ms import{r['first_render_ms']:>10} ms first render")
+        print(f"{'':<4}loaded: {', '.join(r['heavy_modules']) or '-'}")
+        print(f"{'':<4}slowest: " + ', '.join(f"{i['module']} {i['ms']} ms" for i in r['slowest_imports']))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import statistics
+import time
+
+import streamlit_folium
+from streamlit_folium import st_folium
+
+from services.indicator_service import INDICATORS, YEARS
+from services.layer_cache_service import build_layer, build_values, trend_values
+from services.load_data_service import prepare_dataset, table_version
+from services.region_service import region_zoom
+from services.filter_data_service import slice_data
+from services.set_scale_service import get_scale
+from services.snapshot_service import read_table
+from services.tile_service import TILE_DIR, tiles_available
+from services.geometry_service import geometry_version
+from views.choropleth_map import display_live_map, display_tile_map, region_view
+from views.indicator_page import display_base_map
+
+MODES = ('geojson', 'tiles', 'tiles+delta')
+REGIONS = ('All', 'Western Europe', 'Southern Asia')
+
+
+def capture_component():
+    # What st_folium hands to the frontend, instead of rendering it
+    sent = []
+
+    def component(**kwargs):
+        sent.append(kwargs)
+        return kwargs['default']
+    streamlit_folium._component_func = component
+    return sent
+
+
+def send_map(dataset, indicator, year, region, mode):
+    # One rerun's map, built from scratch and passed to st_folium
+    start, end = indicator.slider_value
+    df = slice_data(dataset, year, region, start, end, indicator.column)
+    scale = get_scale(dataset, year, region, start, end, indicator.column)
+    trend = trend_values(dataset, indicator, year)
+    if mode == 'tiles+delta':
+        map, update = display_live_map(build_values(df, scale, indicator, trend))
+        center, zoom = region_view(region)
+        st_folium(map, key=f"map-{indicator.key}", feature_group_to_add=update, center=center, zoom=zoom,
+                  returned_objects=['last_active_drawing'])
+    elif mode == 'tiles':
+        st_folium(display_tile_map(build_values(df, scale, indicator, trend), region))
+    else:
+        st_folium(display_base_map(build_layer(df, scale, indicator, region_zoom(region), trend), region))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes sent, build time and map re-mounts per rerun for each map mode")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--indicator', default=next(iter(INDICATORS)), choices=list(INDICATORS))
+    args = parser.parse_args()
+
+    if any(mode.startswith('tiles') for mode in args.modes) and not tiles_available(TILE_DIR, geometry_version()):
+        parser.error("no vector tiles for the current GeoJSON; run python -m scripts.build_tiles")
+    dataset = prepare_dataset(read_table(), table_version())
+    indicator = INDICATORS[args.indicator]
+    sent = capture_component()
+    print(f"{'mode':<16}{'median KB':>11}{'max KB':>9}{'median ms':>11}{'re-mounts':>11}{'reruns':>8}")
+    for mode in args.modes:
+        sizes = []
+        times = []
+        remounts = 0
+        key = None
+        # A user on one page stepping through years and regions
+        for region in REGIONS:
+            for year in YEARS:
+                start = time.perf_counter()
+                send_map(dataset, indicator, year, region, mode)
+                times.append((time.perf_counter() - start) * 1000)
+                message = sent.pop()
+                sizes.append(len(json.dumps({name: value for name, value in message.items() if name != 'default'})))
+                # A new component key makes the browser tear the map down and build it again
+                remounts += message['key'] != key
+                key = message['key']
+        print(f"{mode:<16}{statistics.median(sizes) / 1024:>11.1f}{max(sizes) / 1024:>9.1f}"
+              f"{statistics.median(times):>11.1f}{remounts:>11}{len(sizes):>8}")
+    print("Client render times per interaction: python -m benchmarks.map_render_benchmark")
+
+
+if __name__ == "__main__":
+    main()
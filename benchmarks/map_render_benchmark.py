@@ -0,0 +1,139 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from services.geometry_service import geometry_version
+from services.indicator_service import YEARS
+from services.tile_service import TILE_DIR, tiles_available
+
+# The same app under each map path, as the payload benchmark compares them
+MODES = {
+    'geojson': {'DASHBOARD_MAP_BACKEND': 'geojson', 'DASHBOARD_MAP_DELTA': '0'},
+    'tiles': {'DASHBOARD_MAP_BACKEND': 'tiles', 'DASHBOARD_MAP_DELTA': '0'},
+    'tiles+delta': {'DASHBOARD_MAP_BACKEND': 'tiles', 'DASHBOARD_MAP_DELTA': '1'},
+}
+REGIONS = ('All', 'Western Europe', 'Southern Asia')
+# No warm-up or file watcher in the app: only the map's work is timed
+APP_ENV = {'DASHBOARD_WARMUP': '0', 'DASHBOARD_RELOAD_INTERVAL': '0'}
+
+# Entries the map script pushed to window.mapTimings since the last mark, in
+# whichever frame holds the map (a re-mount may bring a new frame)
+MARK_TIMINGS = "() => { window.mapTimingsSeen = (window.mapTimings || []).length; }"
+NEW_TIMING = """() => {
+    var timings = window.mapTimings || [];
+    return timings.length > (window.mapTimingsSeen || 0) ? timings[timings.length - 1] : null;
+}"""
+
+
+def start_app(page, port, mode, timeout):
+    process = subprocess.Popen([sys.executable, '-m', 'streamlit', 'run', page, '--server.headless', 'true',
+                                '--server.port', str(port)], env={**os.environ, **APP_ENV, **MODES[mode]},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"{mode}: app did not start within {timeout} s")
+
+
+def map_frames(page):
+    return [frame for frame in page.frames if frame != page.main_frame]
+
+
+def wait_for_timing(page, timeout):
+    # The map's own number for this interaction: mount_ms for a full map,
+    # restyle_ms for a delta update
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for frame in map_frames(page):
+            try:
+                timing = frame.evaluate(NEW_TIMING)
+            except Exception:
+                # Frame torn down by a re-mount
+                continue
+            if timing:
+                return timing
+        page.wait_for_timeout(20)
+    return None
+
+
+def choose(page, label, option):
+    page.locator('[data-testid="stSelectbox"]').filter(has_text=label).locator('[data-baseweb="select"]').click()
+    page.get_by_role('option', name=str(option), exact=True).click()
+
+
+def measure(browser, url, timeout):
+    # A user stepping through years and regions; each change is one rerun
+    page = browser.new_page(viewport={'width': 1280, 'height': 1000})
+    page.goto(url)
+    first = wait_for_timing(page, timeout)
+    if first is None:
+        raise RuntimeError(f"no map timing from {url} within {timeout} s")
+    client = []
+    interaction = []
+    current = {'Region': 'All', 'Year': YEARS[0]}
+    for region in REGIONS:
+        for year in YEARS:
+            for label, option in (('Region', region), ('Year', year)):
+                if current[label] == option:
+                    continue
+                for frame in map_frames(page):
+                    try:
+                        frame.evaluate(MARK_TIMINGS)
+                    except Exception:
+                        continue
+                start = time.perf_counter()
+                choose(page, label, option)
+                timing = wait_for_timing(page, timeout)
+                if timing is None:
+                    raise RuntimeError(f"no map timing after choosing {label} {option}")
+                interaction.append((time.perf_counter() - start) * 1000)
+                client.append(next(iter(timing.values())))
+                current[label] = option
+    page.close()
+    return first, client, interaction
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client render time per interaction for each map path, "
+                                                 "measured in headless Chromium against a running app")
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    parser.add_argument('--page', default='home.py')
+    parser.add_argument('--port', type=int, default=8599)
+    parser.add_argument('--timeout', type=float, default=60, help="seconds to wait for the app or a map")
+    args = parser.parse_args()
+
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        parser.error("needs Playwright: pip install playwright && python -m playwright install chromium")
+    if any(mode.startswith('tiles') for mode in args.modes) and not tiles_available(TILE_DIR, geometry_version()):
+        parser.error("no vector tiles for the current GeoJSON; run python -m scripts.build_tiles")
+
+    print(f"{'mode':<16}{'first ms':>10}{'client median':>15}{'client max':>12}{'interaction median':>20}{'reruns':>8}")
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        for mode in args.modes:
+            app = start_app(args.page, args.port, mode, args.timeout)
+            try:
+                first, client, interaction = measure(browser, f"http://localhost:{args.port}", args.timeout)
+            finally:
+                app.terminate()
+                app.wait()
+            print(f"{mode:<16}{next(iter(first.values())):>10.1f}{statistics.median(client):>15.1f}"
+                  f"{max(client):>12.1f}{statistics.median(interaction):>20.1f}{len(client):>8}")
+        browser.close()
+    print("client: the map script's mount_ms (full map) or restyle_ms (delta update); "
+          "interaction: from choosing an option to that number being recorded")
+
+
+if __name__ == "__main__":
+    main()
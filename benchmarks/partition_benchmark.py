@@ -0,0 +1,47 @@
+import argparse
+import time
+
+from services.dataset_service import Dataset
+from services.indicator_service import INDICATORS
+from services.snapshot_service import read_table
+from tests.helpers import mask_filter, scaled
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def latency(call, repeat):
+    call()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slice latency: boolean masks vs (Year, Region) partitions")
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    base = read_table()
+    query = (2019, 'Western Europe', 5, 7, 'Happiness Score')
+    columns = [indicator.column for indicator in INDICATORS.values()]
+
+    print(f"{'rows':>10}{'index build ms':>16}{'mask ms':>10}{'partition ms':>14}{'speedup':>10}")
+    for rows in SIZES:
+        dataset = Dataset(scaled(base, rows), f"bench-{rows}")
+        start = time.perf_counter()
+        dataset.partitions.sort_columns(columns)
+        build_s = time.perf_counter() - start
+
+        expected = mask_filter(dataset.df, *query)
+        year, region, low, high, column = query
+        assert dataset.partitions.query(year, region, column, low, high).index.equals(expected.index)
+
+        mask_s = latency(lambda: mask_filter(dataset.df, *query), args.repeat)
+        partition_s = latency(lambda: dataset.partitions.query(year, region, column, low, high), args.repeat)
+        print(f"{rows:>10}{build_s * 1000:>16.1f}{mask_s * 1000:>10.3f}"
+              f"{partition_s * 1000:>14.3f}{mask_s / partition_s:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.partition_benchmark import latency
+from services.dataset_service import Dataset
+from services.indicator_service import INDICATORS
+from services.set_scale_service import get_scale
+from services.snapshot_service import read_table
+from tests.helpers import mask_filter, scaled
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+
+def quantile_scale(df, year, region, start, end, entity):
+    # The previous get_scale body: filter, then quantile one column per call
+    df = mask_filter(df, year, region, start, end, entity)
+    return df[entity].quantile((0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1)).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scale lookup: per-call quantile vs precomputed table")
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    base = read_table()
+    indicator = INDICATORS['hdi']
+    query = (2019, 'Western Europe', *indicator.slider_value, indicator.column)
+    custom = (2019, 'Western Europe', 0.8, 1, indicator.column)
+
+    print(f"{'rows':>10}{'table build ms':>16}{'quantile ms':>13}{'table ms':>10}{'other range ms':>16}")
+    for rows in SIZES:
+        dataset = Dataset(scaled(base, rows), f"bench-{rows}")
+        start = time.perf_counter()
+        dataset.scales
+        build_s = time.perf_counter() - start
+
+        assert np.allclose(get_scale(dataset, *query), quantile_scale(dataset.df, *query))
+        assert np.allclose(get_scale(dataset, *custom), quantile_scale(dataset.df, *custom))
+
+        quantile_s = latency(lambda: quantile_scale(dataset.df, *query), args.repeat)
+        table_s = latency(lambda: get_scale(dataset, *query), args.repeat)
+        custom_s = latency(lambda: get_scale(dataset, *custom), args.repeat)
+        print(f"{rows:>10}{build_s * 1000:>16.1f}{quantile_s * 1000:>13.3f}"
+              f"{table_s * 1000:>10.4f}{custom_s * 1000:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+from services.selection_service import MAX_SELECTED
+from tests.helpers import simulate_rerun
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Selection store cost over many reruns")
+    parser.add_argument('--reruns', type=int, default=10000)
+    parser.add_argument('--batches', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    state = {}
+    batch = args.reruns // args.batches
+    timings = []
+    memory = []
+    tracemalloc.start()
+    for _ in range(args.batches):
+        start = time.perf_counter()
+        for _ in range(batch):
+            selection = simulate_rerun(state, rng)
+        timings.append((time.perf_counter() - start) / batch)
+        memory.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+
+    print(f"{'batch':>6}{'us/rerun':>12}{'traced KB':>12}")
+    for i, (seconds, traced) in enumerate(zip(timings, memory)):
+        print(f"{i:>6}{seconds * 1e6:>12.2f}{traced / 1024:>12.1f}")
+
+    failures = []
+    if len(selection) > MAX_SELECTED:
+        failures.append(f"selection grew to {len(selection)} entries")
+    # Constant cost: the slowest late batch stays within 2x the first batch
+    if max(timings[1:]) > 2 * timings[0] + 5e-6:
+        failures.append("per-rerun latency grows with the number of reruns")
+    if memory[-1] > 2 * memory[0] + 64 * 1024:
+        failures.append("session memory grows with the number of reruns")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
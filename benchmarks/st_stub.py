@@ -0,0 +1,46 @@
+import json
+from contextlib import contextmanager
+
+import streamlit as st
+
+RENDER_CALLS = ('altair_chart', 'vega_lite_chart', 'plotly_chart', 'warning', 'write')
+
+
+class RenderRecorder:
+    # Stands in for st.* output calls: records what would have been sent to
+    # the browser instead of needing a running Streamlit server
+
+    def __init__(self):
+        self.calls = []
+
+    def recorder(self, name):
+        def record(*args, **kwargs):
+            payload = args[0] if args else None
+            self.calls.append((name, payload_bytes(payload)))
+        return record
+
+    def payload_bytes(self):
+        return sum(size for _, size in self.calls)
+
+
+def payload_bytes(payload):
+    if isinstance(payload, (dict, list)):
+        return len(json.dumps(payload, default=str))
+    if isinstance(payload, str):
+        return len(payload)
+    if hasattr(payload, 'to_dict'):
+        return len(json.dumps(payload.to_dict(), default=str))
+    return 0
+
+
+@contextmanager
+def stub_streamlit():
+    recorder = RenderRecorder()
+    originals = {name: getattr(st, name) for name in RENDER_CALLS}
+    for name in RENDER_CALLS:
+        setattr(st, name, recorder.recorder(name))
+    try:
+        yield recorder
+    finally:
+        for name, original in originals.items():
+            setattr(st, name, original)
@@ -0,0 +1,87 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+
+from services.snapshot_service import DATA_FILE, SNAPSHOT_FILE, apply_schema, build_snapshot, read_snapshot
+
+
+def rss_kb():
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def load_csv():
+    import pandas as pd
+    return apply_schema(pd.read_csv(DATA_FILE))
+
+
+def load_snapshot():
+    data = read_snapshot(SNAPSHOT_FILE, DATA_FILE)
+    if data is None:
+        raise RuntimeError(f"{SNAPSHOT_FILE} is missing or stale")
+    return data
+
+
+LOADERS = {'csv': load_csv, 'snapshot': load_snapshot}
+
+
+def measure(mode, repeat, queue):
+    # Runs in a fresh process so the resident set only reflects this loader
+    import pandas  # noqa: F401
+    import pyarrow  # noqa: F401
+    loader = LOADERS[mode]
+    rss_before = rss_kb()
+
+    start = time.perf_counter()
+    data = loader()
+    first = time.perf_counter() - start
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loader()
+        timings.append(time.perf_counter() - start)
+
+    queue.put({
+        'mode': mode,
+        'rows': len(data),
+        'cold_ms': round(first * 1000, 3),
+        'warm_ms': round(min(timings) * 1000, 3),
+        'rss_delta_kb': rss_kb() - rss_before,
+        'frame_kb': int(data.memory_usage(deep=True).sum() // 1024),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV parse and snapshot load at startup")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args()
+
+    if read_snapshot(SNAPSHOT_FILE, DATA_FILE) is None:
+        build_snapshot(DATA_FILE, SNAPSHOT_FILE)
+
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    for mode in LOADERS:
+        queue = ctx.Queue()
+        process = ctx.Process(target=measure, args=(mode, args.repeat, queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'mode':<10}{'rows':>8}{'cold ms':>10}{'warm ms':>10}{'rss KB':>10}{'frame KB':>10}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['rows']:>8}{r['cold_ms']:>10}{r['warm_ms']:>10}"
+              f"{r['rss_delta_kb']:>10}{r['frame_kb']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import threading
+
+from streamlit.runtime.scriptrunner import ScriptRunContext, add_script_run_ctx
+from streamlit.runtime.state import SafeSessionState, SessionState
+from streamlit.runtime.uploaded_file_manager import UploadedFileManager
+
+
+def attach_script_context(thread=None):
+    # st.cache_* and st.session_state only work inside a script run; give a
+    # plain Python thread a throwaway one so services behave as in the app
+    ctx = ScriptRunContext(
+        session_id='benchmark',
+        _enqueue=lambda msg: None,
+        query_string='',
+        session_state=SafeSessionState(SessionState()),
+        uploaded_file_mgr=UploadedFileManager(),
+        page_script_hash='',
+        user_info={'email': 'benchmark@localhost'},
+    )
+    add_script_run_ctx(thread or threading.current_thread(), ctx)
+    return ctx
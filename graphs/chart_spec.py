@@ -0,0 +1,35 @@
+from contextlib import nullcontext
+
+import altair as alt
+import pandas as pd
+
+# Generous bound per plotted value in a spec's data: key, quotes,
+# separators and a short number
+MAX_BYTES_PER_VALUE = 80
+
+
+def compact_floats(series):
+    # Shortest float32 repr, so 0.954 is sent as 0.954 and not 0.9539999961853027
+    return series.astype('float32').astype(str).astype(float)
+
+
+def compact_frame(df, columns):
+    # Only the columns a chart encodes, in types that serialise compactly
+    compact = {}
+    for column in dict.fromkeys(columns):
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype(str)
+        elif pd.api.types.is_integer_dtype(series):
+            series = series.astype(int)
+        elif pd.api.types.is_float_dtype(series):
+            series = compact_floats(series)
+        compact[column] = series
+    return pd.DataFrame(compact, index=df.index)
+
+
+def chart_spec(chart):
+    # Same theme handling as st.altair_chart, with the data inlined as JSON
+    theme = alt.themes.enable('none') if alt.themes.active == 'default' else nullcontext()
+    with theme:
+        return chart.to_dict()
@@ -1,17 +1,49 @@
-import streamlit as st
-import altair as alt
+import json
 
 import streamlit as st
 import altair as alt
 
-@st.cache_resource
-def display_past_data(df, countries, x_axis, y_axis, color_channel, tooltip_data:list, title):
-    df = df[df["Country"].isin(countries)].copy()  # Create a copy of the DataFrame
-    df['Year'] = df['Year'].astype(int)
-    
-    chart = alt.Chart(df).mark_line(point=True).encode(
+from graphs.chart_spec import chart_spec, compact_frame
+from services.cache_service import LRUCache
+from services.instrumentation_service import instrument, record_payload, register_cache
+
+WIDE_VALUE = 'value'
+SPEC_CACHE_SIZE = 512
+SPEC_CACHE = register_cache('trend_specs', LRUCache(SPEC_CACHE_SIZE))
+
+
+def chart_columns(x_axis, y_axis, color_channel, tooltip_data):
+    return [x_axis, y_axis, color_channel] + list(tooltip_data)
+
+
+def line_chart_data(df, countries, x_axis, y_axis, color_channel, tooltip_data, wide=False, selected=False):
+    # Only the columns the chart encodes go into the Vega-Lite spec
+    columns = chart_columns(x_axis, y_axis, color_channel, tooltip_data)
+    if not selected:
+        df = df.loc[df["Country"].isin(countries)]
+    df = compact_frame(df, columns)
+
+    if wide:
+        # One row per x value and one column per series; the chart folds it back
+        df = df.pivot_table(index=x_axis, columns=color_channel, values=y_axis, observed=True)
+        df = df.reset_index()
+        df.columns = [str(column) for column in df.columns]
+    return df
+
+
+def line_chart(df, x_axis, y_axis, color_channel, tooltip_data, title, wide=False):
+    chart = alt.Chart(df)
+    y = alt.Y(y_axis, axis=alt.Axis(title=y_axis))  # Specify the title for y-axis
+    if wide:
+        series = [column for column in df.columns if column != x_axis]
+        chart = chart.transform_fold(series, as_=[color_channel, WIDE_VALUE])
+        y = alt.Y(WIDE_VALUE, type='quantitative', axis=alt.Axis(title=y_axis))
+        tooltip_data = [alt.Tooltip(color_channel, type='nominal'), x_axis, alt.Tooltip(WIDE_VALUE, type='quantitative', title=y_axis)]
+        color_channel = alt.Color(color_channel, type='nominal')
+
+    return chart.mark_line(point=True).encode(
         x=alt.X(x_axis, axis=alt.Axis(format='d', labelFlush=False)),
-        y=alt.Y(y_axis, axis=alt.Axis(title=y_axis)),  # Specify the title for y-axis
+        y=y,
         color=color_channel,
         tooltip=tooltip_data
     ).properties(
@@ -24,5 +56,36 @@ def display_past_data(df, countries, x_axis, y_axis, color_channel, tooltip_data
         titleFontSize=14,  # Adjust the title font size
         labelFontSize=12,  # Adjust the label font size
     )
-    
-    st.altair_chart(chart, use_container_width=True)
+
+
+def trend_rows(dataset, countries, columns):
+    # Slices of the time-series cube by country index, or a filter over the
+    # table for columns the cube doesn't hold
+    if dataset.trends.covers(columns):
+        return dataset.trends.frame(countries, columns)
+    return dataset.df.loc[dataset.df["Country"].isin(countries)]
+
+
+def build_past_data_spec(dataset, countries, x_axis, y_axis, color_channel, tooltip_data, title, wide=False):
+    rows = trend_rows(dataset, countries, chart_columns(x_axis, y_axis, color_channel, tooltip_data))
+    df = line_chart_data(rows, countries, x_axis, y_axis, color_channel, tooltip_data, wide, selected=True)
+    return chart_spec(line_chart(df, x_axis, y_axis, color_channel, tooltip_data, title, wide))
+
+
+def past_data_spec(dataset, countries, x_axis, y_axis, color_channel, tooltip_data, title, wide=False):
+    # Specs are shared across sessions, so callers must not mutate them
+    key = (dataset.version, tuple(sorted(countries)), y_axis,
+           x_axis, color_channel, tuple(tooltip_data), title, wide)
+    return SPEC_CACHE.get(key, lambda: build_past_data_spec(
+        dataset, countries, x_axis, y_axis, color_channel, tooltip_data, title, wide))
+
+
+def past_data_cache_stats():
+    return SPEC_CACHE.stats()
+
+
+@instrument('display_past_data')
+def display_past_data(dataset, countries, x_axis, y_axis, color_channel, tooltip_data:list, title, wide=False):
+    spec = past_data_spec(dataset, countries, x_axis, y_axis, color_channel, tooltip_data, title, wide)
+    record_payload('display_past_data', lambda: len(json.dumps(spec)))
+    st.vega_lite_chart(spec, use_container_width=True)
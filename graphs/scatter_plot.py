@@ -1,12 +1,21 @@
+import json
+
 import streamlit as st
 import altair as alt
 
+from graphs.chart_spec import chart_spec, compact_frame
+from services.cache_service import LRUCache
 from services.filter_data_service import filter_data
+from services.indicator_service import HAPPINESS, INDICATORS, YEARS
+from services.instrumentation_service import instrument, record_payload, register_cache
+
+SCATTER_CACHE_SIZE = 4096
+SCATTER_CACHE = register_cache('scatter_specs', LRUCache(SCATTER_CACHE_SIZE))
+
 
-def scatterplot(data, year, region, start, end, x_axis, y_axis):
+def scatter_chart(df, x_axis, y_axis):
     var_rank = x_axis + " Rank"
-    df = filter_data(data, year, region, start, end, x_axis)
-    chart = alt.Chart(df).mark_point(
+    return alt.Chart(df).mark_point(
         opacity=0.7,
         size=80,  # Increased the size for better visibility
     ).encode(
@@ -24,4 +33,44 @@ def scatterplot(data, year, region, start, end, x_axis, y_axis):
         labelFontSize=12,  # Adjust the label font size
     )
 
-    st.altair_chart(chart, use_container_width=True)
+
+def build_scatter_spec(dataset, year, region, start, end, x_axis, y_axis):
+    # Same slice as the map, projected to the plotted and tooltip columns
+    df = filter_data(dataset, year, region, start, end, x_axis)
+    columns = [x_axis, y_axis, 'Region', 'Country', 'Happiness Rank', x_axis + " Rank"]
+    return json.dumps(chart_spec(scatter_chart(compact_frame(df, columns), x_axis, y_axis)))
+
+
+def scatter_spec_json(dataset, year, region, start, end, x_axis, y_axis):
+    # Shared by every session; a JSON string, so nobody can mutate it
+    key = (dataset.version, x_axis, y_axis, year, region, start, end)
+    return SCATTER_CACHE.get(key, lambda: build_scatter_spec(
+        dataset, year, region, start, end, x_axis, y_axis))
+
+
+def scatter_cache_stats():
+    return SCATTER_CACHE.stats()
+
+
+def precompute_scatter_specs(dataset, regions, indicators=INDICATORS, years=YEARS, stop=None):
+    # Default slider range for every indicator x year x region combination;
+    # returns early once stop is set
+    count = 0
+    for indicator in indicators.values():
+        if not indicator.scatter:
+            continue
+        start, end = indicator.slider_value
+        for year in years:
+            for region in regions:
+                if stop is not None and stop.is_set():
+                    return count
+                scatter_spec_json(dataset, year, region, start, end, indicator.column, HAPPINESS.column)
+                count += 1
+    return count
+
+
+@instrument('scatterplot')
+def scatterplot(dataset, year, region, start, end, x_axis, y_axis):
+    spec = scatter_spec_json(dataset, year, region, start, end, x_axis, y_axis)
+    record_payload('scatterplot', len(spec))
+    st.vega_lite_chart(json.loads(spec), use_container_width=True)
@@ -1,18 +1,13 @@
 import pandas as pd
 import streamlit as st
 import plotly.graph_objs as go
-from services.load_data_service import load_data
+from services.load_data_service import load_dataset
+from services.instrumentation_service import instrument_page
 
 APP_TITLE = "Analysis"
+METHODS = {'Pearson': 'pearson', 'Spearman': 'spearman'}
 
-def main():
-    st.title(APP_TITLE)
-    geo_data, data, regions = load_data()
-    data = data.drop(columns=['Happiness Rank', 'Corruption Rank', 'Inequality in life expectancy'])
-    data = data.iloc[:, 1: 13]
-    # Calculate the correlation matrix
-    correlation_matrix = data.corr()
-
+def correlation_figure(correlation_matrix):
     # Create a heatmap using Plotly
     fig = go.Figure(data=go.Heatmap(
         z=correlation_matrix.values,
@@ -29,6 +24,27 @@ def main():
         height=800,  # Adjust the height as per your preference
     )
 
+    return fig
+
+@instrument_page('analysis')
+def main():
+    st.title(APP_TITLE)
+    # Only the analysis columns are read; no partitions or scale tables are built
+    dataset = load_dataset('analysis')
+    engine = dataset.correlations
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        method = st.radio('Correlation', list(METHODS), horizontal=True)
+    with col2:
+        years = st.multiselect('Years', engine.years())
+    with col3:
+        selected_regions = st.multiselect('Regions', engine.regions())
+
+    # Pearson sums per (Year, Region) cell; Spearman is memoised per selection
+    correlation_matrix = engine.correlation(METHODS[method], years, selected_regions)
+
+    fig = correlation_figure(correlation_matrix)
     st.plotly_chart(fig)
 
 if __name__ == "__main__":
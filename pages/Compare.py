@@ -0,0 +1,49 @@
+import streamlit as st
+import streamlit.components.v1 as components
+
+from services.comparison_service import get_comparison
+from services.indicator_service import INDICATORS, YEARS
+from services.layer_cache_service import level_features
+from services.load_data_service import load_dataset, load_regions
+from services.region_service import region_zoom
+from services.instrumentation_service import instrument_page, record_payload, timed
+from views.comparison_map import display_comparison, figure_height
+
+APP_TITLE = "Compare Indicators"
+
+
+@instrument_page('compare')
+def main():
+    st.title(APP_TITLE)
+    with timed('load_data'):
+        dataset = load_dataset()
+        regions = load_regions()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        year = st.selectbox('Year', YEARS)
+    with col2:
+        region = st.selectbox('Region', regions)
+    titles = {indicator.title: indicator for indicator in INDICATORS.values()}
+    selected = st.multiselect('Indicators', list(titles), default=list(titles))
+
+    # Every indicator's scale, ranks and colors for this slice in one pass,
+    # at each indicator's default range
+    comparison = get_comparison(dataset, year, region)
+    layers = [comparison[titles[title].key] for title in selected]
+    missing = [title for title, layer in zip(selected, layers) if layer is None]
+    layers = [layer for layer in layers if layer is not None]
+    if missing:
+        st.info("No data for the selected filters: " + ", ".join(missing))
+    if not layers:
+        return
+
+    figure = display_comparison(layers, level_features(region_zoom(region)), region)
+    html = figure.render()
+    record_payload('map', len(html))
+    with timed('components_html'):
+        components.html(html, height=figure_height(len(layers)) + 20)
+
+
+if __name__ == "__main__":
+    main()
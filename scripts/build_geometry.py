@@ -0,0 +1,17 @@
+import argparse
+
+from services.geometry_service import GEOJSON_FILE, GEOMETRY_DIR, build_geometry_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-simplify countries.geo.json for every map zoom level")
+    parser.add_argument('--source', default=GEOJSON_FILE)
+    parser.add_argument('--out', default=GEOMETRY_DIR)
+    args = parser.parse_args()
+
+    for path in build_geometry_cache(args.source, args.out):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import argparse
+
+from services.snapshot_service import DATA_FILE, SNAPSHOT_FILE, build_snapshot, snapshot_digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile data.csv into a typed columnar snapshot")
+    parser.add_argument('--csv', default=DATA_FILE)
+    parser.add_argument('--out', default=SNAPSHOT_FILE)
+    args = parser.parse_args()
+
+    path = build_snapshot(args.csv, args.out)
+    print(f"Wrote {path} (sha256 {snapshot_digest(path)[:12]})")
+
+
+if __name__ == "__main__":
+    main()
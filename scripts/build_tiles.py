@@ -0,0 +1,19 @@
+import argparse
+
+from services.geometry_service import GEOJSON_FILE
+from services.tile_service import TILE_DIR, TILE_ZOOMS, build_tiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cut countries.geo.json into vector tiles for the tile map backend")
+    parser.add_argument('--source', default=GEOJSON_FILE)
+    parser.add_argument('--out', default=TILE_DIR)
+    parser.add_argument('--zooms', type=int, nargs='+', default=TILE_ZOOMS)
+    args = parser.parse_args()
+
+    for zoom, size in build_tiles(args.source, args.out, tuple(args.zooms)).items():
+        print(f"Wrote {2 ** zoom * 2 ** zoom} tiles for zoom {zoom} ({size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
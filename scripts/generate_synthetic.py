@@ -0,0 +1,171 @@
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+from shapely import make_valid
+from shapely.geometry import box, mapping, shape
+
+from services.geometry_service import GEOJSON_FILE
+from services.snapshot_service import DATA_FILE
+
+DEFAULT_YEARS = (2015, 2021)
+OUT_DIR = "data/synthetic"
+# Spread of a sub-national unit around its country, and the yearly trend
+# and noise, as fractions of each metric's spread across the real table
+UNIT_SPREAD = 0.15
+TREND_SPREAD = 0.01
+NOISE_SPREAD = 0.02
+
+
+def rank_sources(df):
+    # Rank column -> (metric it ranks, rank 1 is the highest value)
+    sources = {}
+    for column in df.columns:
+        if not column.endswith(' Rank'):
+            continue
+        metric = column[:-len(' Rank')]
+        if metric not in df:
+            metric = metric + ' Score'
+        descending = df[[metric, column]].corr(method='spearman').iloc[0, 1] < 0
+        sources[column] = (metric, bool(descending))
+    return sources
+
+
+def metric_columns(df):
+    return [column for column in df.columns
+            if column != 'Year' and not column.endswith(' Rank')
+            and pd.api.types.is_numeric_dtype(df[column])]
+
+
+def load_countries(geojson_path=GEOJSON_FILE):
+    with open(geojson_path) as f:
+        return json.load(f)['features']
+
+
+def unit_names(countries, units):
+    # Whole countries first, then sub-national units round-robin across
+    # countries, so any row count covers the map evenly
+    names = []
+    parents = []
+    for level in range(math.ceil(units / len(countries))):
+        for country in countries:
+            names.append(country if level == 0 else f"{country} - Unit {level}")
+            parents.append(country)
+    return names[:units], parents[:units]
+
+
+def synthetic_table(rows=None, years=DEFAULT_YEARS, subunits=0, seed=0,
+                    base_path=DATA_FILE, geojson_path=GEOJSON_FILE):
+    # Same columns, dtypes and rank semantics as data.csv. Each unit starts
+    # from a real row (its country's latest, or a random one) so metrics keep
+    # their joint distribution, then drifts year by year.
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(base_path)
+    countries = [feature['properties']['name'] for feature in load_countries(geojson_path)]
+    year_range = np.arange(years[0], years[1] + 1)
+
+    units = len(countries) * (subunits + 1)
+    if rows is not None:
+        units = math.ceil(rows / len(year_range))
+    names, parents = unit_names(countries, units)
+
+    latest = base.sort_values('Year').groupby('Country').tail(1).set_index('Country')
+    regions = sorted(base['Region'].unique())
+    metrics = metric_columns(base)
+    values = base[metrics].to_numpy(dtype=float)
+    low, high = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
+    spread = np.nanstd(values, axis=0)
+
+    country_rows = {}
+    country_regions = {}
+    for country in countries:
+        if country in latest.index:
+            country_rows[country] = latest.loc[country, metrics].to_numpy(dtype=float)
+            country_regions[country] = latest.loc[country, 'Region']
+        else:
+            row = base.iloc[rng.integers(len(base))]
+            country_rows[country] = row[metrics].to_numpy(dtype=float)
+            country_regions[country] = regions[rng.integers(len(regions))]
+
+    start = np.array([country_rows[parent] for parent in parents])
+    is_unit = np.array([name != parent for name, parent in zip(names, parents)])
+    start = start + is_unit[:, None] * rng.normal(0, UNIT_SPREAD, start.shape) * spread
+    trend = rng.normal(0, TREND_SPREAD, start.shape) * spread
+    steps = np.arange(len(year_range))[None, :, None]
+    noise = rng.normal(0, NOISE_SPREAD, (len(names), len(year_range), len(metrics))) * spread
+    cube = np.clip(start[:, None, :] + trend[:, None, :] * steps + noise, low, high)
+
+    df = pd.DataFrame(cube.reshape(-1, len(metrics)), columns=metrics)
+    df.insert(0, 'Country', np.repeat(names, len(year_range)))
+    df['Year'] = np.tile(year_range, len(names))
+    df['Region'] = np.repeat([country_regions[parent] for parent in parents], len(year_range))
+    if rows is not None:
+        df = df.iloc[:rows]
+
+    for column, (metric, descending) in rank_sources(base).items():
+        df[column] = df.groupby('Year')[metric].rank(method='min', ascending=not descending).astype(int)
+    df = df.sort_values(['Year', 'Happiness Rank'], kind='stable').reset_index(drop=True)
+    return df[list(base.columns)]
+
+
+def unit_geometry(geometry, count):
+    # count vertical strips of the country's bounding box
+    minx, miny, maxx, maxy = geometry.bounds
+    width = (maxx - minx) / count
+    for i in range(count):
+        part = geometry.intersection(box(minx + i * width, miny, minx + (i + 1) * width, maxy))
+        if part.is_empty:
+            part = geometry.representative_point().buffer(width / 10)
+        yield part
+
+
+def synthetic_geometry(df, geojson_path=GEOJSON_FILE):
+    # Real outlines for countries, strips of their country for sub-national units
+    features = {feature['properties']['name']: feature for feature in load_countries(geojson_path)}
+    names = pd.unique(df['Country'])
+    units = {}
+    for name in names:
+        if name not in features:
+            units.setdefault(name.split(' - Unit ')[0], []).append(name)
+
+    collection = [features[name] for name in names if name in features]
+    for country, unit_list in units.items():
+        parts = unit_geometry(make_valid(shape(features[country]['geometry'])), len(unit_list))
+        for name, part in zip(unit_list, parts):
+            collection.append({
+                'type': 'Feature',
+                'id': f"{features[country].get('id')}-{name.rsplit(' ', 1)[-1]}",
+                'properties': {'name': name},
+                'geometry': mapping(part),
+            })
+    return {'type': 'FeatureCollection', 'features': collection}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic dataset shaped like data/data.csv")
+    parser.add_argument('--rows', type=int, help="exact row count (default: every unit for every year)")
+    parser.add_argument('--years', type=int, nargs=2, default=DEFAULT_YEARS, metavar=('FIRST', 'LAST'))
+    parser.add_argument('--subunits', type=int, default=0, help="sub-national units per country")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default=OUT_DIR)
+    parser.add_argument('--no-geometry', action='store_true')
+    args = parser.parse_args()
+
+    df = synthetic_table(args.rows, tuple(args.years), args.subunits, args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    df.to_csv(os.path.join(args.out, 'data.csv'), index=False)
+    pd.DataFrame({'Regions': ['All'] + sorted(df['Region'].unique())}).to_csv(
+        os.path.join(args.out, 'regions.csv'), index=False)
+    print(f"Wrote {len(df)} rows for {df['Country'].nunique()} units to {args.out}")
+    if not args.no_geometry:
+        geometry = synthetic_geometry(df)
+        with open(os.path.join(args.out, 'countries.geo.json'), 'w') as f:
+            json.dump(geometry, f)
+        print(f"Wrote {len(geometry['features'])} features")
+
+
+if __name__ == "__main__":
+    main()
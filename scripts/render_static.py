@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from services.indicator_service import HAPPINESS, INDICATORS, YEARS
+
+STATIC_DIR = "static/views"
+MANIFEST_FILE = "manifest.json"
+
+# Loaded once per worker process
+DATASET = None
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-') or 'all'
+
+
+def view_dir(out, indicator_key, year, region):
+    return os.path.join(out, indicator_key, str(year), slug(region))
+
+
+def load_worker():
+    global DATASET
+    from services.load_data_service import load_data
+    _, DATASET, _ = load_data()
+
+
+def write_text(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def render_view(out, indicator_key, year, region):
+    # Map HTML plus the scatter and default trend chart specs of one page view
+    from graphs.line_chart import past_data_spec
+    from graphs.scatter_plot import scatter_spec_json
+    from services.filter_data_service import filter_data
+    from services.layer_cache_service import get_layer
+    from views.indicator_page import display_base_map
+
+    start_time = time.perf_counter()
+    indicator = INDICATORS[indicator_key]
+    start, end = indicator.slider_value
+    folder = view_dir(out, indicator_key, year, region)
+    files = []
+
+    df = filter_data(DATASET, year, region, start, end, indicator.column)
+    if not df.empty:
+        layer = get_layer(DATASET, indicator, year, region, start, end)
+        html = display_base_map(layer, region).get_root().render()
+        files.append(write_text(os.path.join(folder, 'map.html'), html))
+
+        if indicator.scatter:
+            spec = scatter_spec_json(DATASET, year, region, start, end, indicator.column, HAPPINESS.column)
+            files.append(write_text(os.path.join(folder, 'scatter.json'), spec))
+
+        # The page starts with the first country of the slice selected
+        countries = df['Country'].astype(str).unique().tolist()[:1]
+        for shown in dict.fromkeys([indicator, HAPPINESS]):
+            spec = past_data_spec(DATASET, countries, 'Year', shown.column, 'Country',
+                                  ['Country', shown.column, shown.rank_column], shown.trend_title)
+            path = os.path.join(folder, f"trend-{shown.key}.json")
+            files.append(write_text(path, json.dumps(spec)))
+
+    return {
+        'indicator': indicator_key,
+        'year': year,
+        'region': region,
+        'files': [os.path.relpath(path, out) for path in files],
+        'render_ms': round((time.perf_counter() - start_time) * 1000, 3),
+    }
+
+
+def render_analysis(out):
+    from pages.Analysis import correlation_figure
+
+    start_time = time.perf_counter()
+    engine = DATASET.correlations
+    files = []
+    for method in ('pearson', 'spearman'):
+        figure = correlation_figure(engine.correlation(method))
+        path = os.path.join(out, 'analysis', f"{method}.html")
+        files.append(write_text(path, figure.to_html(include_plotlyjs='cdn')))
+    return {
+        'indicator': 'analysis',
+        'files': [os.path.relpath(path, out) for path in files],
+        'render_ms': round((time.perf_counter() - start_time) * 1000, 3),
+    }
+
+
+def views(regions, indicators, years):
+    return [(key, year, region) for key in indicators for year in years for region in regions]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every indicator x year x region view to static files")
+    parser.add_argument('--out', default=STATIC_DIR)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--indicator', action='append', choices=list(INDICATORS),
+                        help="limit to these indicators (repeatable)")
+    parser.add_argument('--year', action='append', type=int, choices=YEARS, help="limit to these years (repeatable)")
+    parser.add_argument('--region', action='append', help="limit to these regions (repeatable)")
+    args = parser.parse_args()
+
+    load_worker()
+    from services.load_data_service import load_data
+    regions = args.region or load_data()[2]
+    tasks = views(regions, args.indicator or list(INDICATORS), args.year or YEARS)
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=load_worker) as pool:
+        futures = [pool.submit(render_view, args.out, *task) for task in tasks]
+        futures.append(pool.submit(render_analysis, args.out))
+        results = [future.result() for future in futures]
+    wall_s = time.perf_counter() - start_time
+
+    render_ms = np.array([result['render_ms'] for result in results])
+    summary = {
+        'views': len(results),
+        'workers': args.workers,
+        'wall_s': round(wall_s, 3),
+        'render_ms_p50': round(float(np.percentile(render_ms, 50)), 3),
+        'render_ms_p95': round(float(np.percentile(render_ms, 95)), 3),
+        'render_ms_max': round(float(render_ms.max()), 3),
+        'render_s_total': round(float(render_ms.sum()) / 1000, 3),
+    }
+    write_text(os.path.join(args.out, MANIFEST_FILE),
+               json.dumps({'summary': summary, 'views': results}, indent=2))
+
+    for result in sorted(results, key=lambda r: r['render_ms'], reverse=True)[:5]:
+        print(f"{result['render_ms']:>10.1f} ms  {result['indicator']} "
+              f"{result.get('year', '')} {result.get('region', '')}")
+    print(f"Rendered {summary['views']} views with {args.workers} workers in {summary['wall_s']} s "
+          f"(p50 {summary['render_ms_p50']} ms, p95 {summary['render_ms_p95']} ms, "
+          f"{summary['render_s_total']} s of render time)")
+
+
+if __name__ == "__main__":
+    main()
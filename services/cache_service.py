@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    # Process-wide cache shared by every session. Unlike st.cache_*, it also
+    # works from background threads and scripts without a ScriptRunContext.
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.build_seconds = 0.0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        start = time.perf_counter()
+        value = build()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.build_seconds += elapsed
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def evict(self, match):
+        # Drop every entry whose key matches, e.g. keys of a retired data version
+        with self._lock:
+            keys = [key for key in self._entries if match(key)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.build_seconds = 0.0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'mean_build_ms': 1000 * self.build_seconds / self.misses if self.misses else 0.0,
+        }
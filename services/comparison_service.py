@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from services.cache_service import LRUCache
+from services.country_index_service import MISSING_RANK, MISSING_SCORE, SCORE_SCALE, encode_column
+from services.geometry_service import country_order
+from services.indicator_service import INDICATORS
+from services.instrumentation_service import instrument, register_cache
+from services.layer_cache_service import (NAN_FILL_COLOR, TREND_COLUMNS, fill_color, highlight_color, palette_colors,
+                                          trend_values)
+from services.scale_table_service import DECILES
+
+COMPARISON_CACHE = register_cache('comparisons', LRUCache(256))
+
+
+def masked_values(rows, indicators):
+    # Slice x indicator matrix, NaN outside each indicator's default range
+    values = rows[[indicator.column for indicator in indicators]].to_numpy(dtype=float)
+    start, end = np.array([indicator.slider_value for indicator in indicators], dtype=float).T
+    present = (values >= start) & (values <= end)
+    return np.where(present, values, np.nan), present
+
+
+def column_quantiles(values, quantiles=DECILES):
+    # sorted_quantiles for every column at once; NaNs sort last and are
+    # left out by counting only the present values
+    if len(values) == 0:
+        return np.full((len(quantiles), values.shape[1]), np.nan)
+    ordered = np.sort(values, axis=0)
+    counts = np.sum(~np.isnan(values), axis=0)
+    positions = np.asarray(quantiles)[:, None] * np.maximum(counts - 1, 0)
+    lower = np.floor(positions).astype(int)
+    upper = np.ceil(positions).astype(int)
+    fraction = positions - lower
+    low = np.take_along_axis(ordered, lower, axis=0)
+    high = np.take_along_axis(ordered, upper, axis=0)
+    scales = low + (high - low) * fraction
+    scales[:, counts == 0] = np.nan
+    return scales
+
+
+def column_positions(values, scales):
+    # np.digitize per column, with the same right-inclusive last bin as
+    # color_positions: the count of edges at or below each value
+    edges = scales.copy()
+    edges[-1] = np.nextafter(edges[-1], np.inf)
+    positions = np.sum(values[:, None, :] >= edges[None, :, :], axis=1) - 1
+    return np.clip(positions, 0, len(scales) - 2)
+
+
+def compare_slice(dataset, year, region, indicators=tuple(INDICATORS.values())):
+    # Scales, ranks and color positions of every indicator for one
+    # (year, region) slice, computed on one matrix instead of per page
+    partition = dataset.partitions.partition(year, region)
+    positions = partition.positions if partition is not None else np.array([], dtype=int)
+    rows = dataset.df.iloc[positions]
+    values, present = masked_values(rows, indicators)
+    scales = column_quantiles(values)
+    # Binned on the raw values, as build_values does; the score column is rounded
+    styles = column_positions(values, scales)
+    scores = np.round(values, 2)
+    missing_position = len(DECILES) - 1
+
+    order = country_order()
+    found = pd.Index(order).get_indexer(rows['Country'].astype(str))
+    keep = found >= 0
+    found = found[keep]
+    style = np.full((len(order), len(indicators)), missing_position, dtype=np.uint8)
+    style[found] = np.where(present, styles, missing_position)[keep]
+    score = np.full((len(order), len(indicators)), MISSING_SCORE, dtype='<i4')
+    score[found] = np.where(present, np.rint(scores * SCORE_SCALE), MISSING_SCORE)[keep]
+    ranks = rows[[indicator.rank_column for indicator in indicators]].to_numpy()
+    rank = np.full((len(order), len(indicators)), MISSING_RANK, dtype='<i2')
+    rank[found] = np.where(present, ranks, MISSING_RANK)[keep]
+
+    layers = {}
+    for i, indicator in enumerate(indicators):
+        if not present[:, i].any():
+            # Same as a page whose filtered slice is empty
+            layers[indicator.key] = None
+            continue
+        colors = palette_colors(indicator.palette, missing_position)
+        fills = colors + [NAN_FILL_COLOR]
+        trend = trend_values(dataset, indicator, year)
+        layers[indicator.key] = {
+            'columns': {'style': encode_column(style[:, i]), 'score': encode_column(score[:, i]),
+                        'rank': encode_column(rank[:, i]), **{name: trend[name] for name in TREND_COLUMNS}},
+            'years': trend['years'],
+            'fills': [fill_color(fill) for fill in fills],
+            'highlights': [highlight_color(fill) for fill in fills],
+            'legend': {'colors': colors, 'thresholds': scales[:, i].tolist(), 'caption': indicator.column},
+            'aliases': ['Country: ', indicator.rank_column, indicator.column] + trend['aliases'],
+        }
+    return layers
+
+
+@instrument('get_comparison')
+def get_comparison(dataset, year, region):
+    key = (dataset.version, year, region)
+    return COMPARISON_CACHE.get(key, lambda: compare_slice(dataset, year, region))
@@ -0,0 +1,170 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from services.cache_service import LRUCache
+from services.instrumentation_service import register_cache
+from services.partition_service import REGION_COLUMN, YEAR_COLUMN
+
+# Same feature selection the Analysis page has always plotted
+ANALYSIS_COLUMNS = (
+    'Happiness Score',
+    'Corruption',
+    'Human Development Index',
+    'Life Expectancy at Birth',
+    'Expected Years of Schooling',
+    'Mean Years of Schooling',
+    'Gross National Income Per Capita',
+    'Gender Development Index',
+    'Inequality in eduation',
+    'Gender Inequality Index',
+    'Maternal Mortality Ratio (deaths per 100,000 live births)',
+    'Carbon dioxide emissions per capita (production) (tonnes)',
+)
+METHODS = ('pearson', 'spearman')
+# Spearman matrices of the year/region selections users pick, shared by all
+# sessions; keyed by data version so a reload's release evicts them
+SPEARMAN_CACHE_SIZE = 256
+SPEARMAN_CACHE = register_cache('spearman', LRUCache(SPEARMAN_CACHE_SIZE))
+
+
+def analysis_columns(df):
+    return [column for column in ANALYSIS_COLUMNS if column in df]
+
+
+class CoMoments:
+    # Pairwise-complete sums for a block of rows. Values are shifted by a
+    # fixed reference before summing so the raw sums stay well conditioned,
+    # and two blocks with the same shift merge by adding their sums.
+
+    def __init__(self, count, sums, squares, products):
+        self.count = count
+        self.sums = sums
+        self.squares = squares
+        self.products = products
+
+    @classmethod
+    def empty(cls, size):
+        zeros = np.zeros((size, size))
+        return cls(zeros, zeros.copy(), zeros.copy(), zeros.copy())
+
+    @classmethod
+    def from_values(cls, values, shift):
+        present = ~np.isnan(values)
+        mask = present.astype(float)
+        centred = np.where(present, values - shift, 0.0)
+        # sums[i, j] is the sum of column i over rows where i and j are both present
+        return cls(mask.T @ mask, centred.T @ mask, (centred ** 2).T @ mask, centred.T @ centred)
+
+    def __add__(self, other):
+        return CoMoments(self.count + other.count, self.sums + other.sums,
+                         self.squares + other.squares, self.products + other.products)
+
+    def correlation(self):
+        n = self.count
+        covariance = n * self.products - self.sums * self.sums.T
+        variance = n * self.squares - self.sums ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = covariance / np.sqrt(variance * variance.T)
+        matrix[n < 2] = np.nan
+        return np.clip(matrix, -1, 1)
+
+
+class CorrelationEngine:
+    # Pearson co-moments kept per (Year, Region) cell, so any union of years
+    # and regions is a sum of small matrices; Spearman needs ranks over the
+    # whole selection, so it is computed per slice and kept in SPEARMAN_CACHE
+
+    def __init__(self, df, columns=None, shift=None, cells=None, version=None):
+        self.df = df
+        # Engines built without a data version get a cache key of their own
+        self.version = object() if version is None else version
+        self.columns = columns or analysis_columns(df)
+        values = self.values(df)
+        self.shift = np.nanmean(values, axis=0) if shift is None else shift
+        self.cells = dict(cells or {})
+        if cells is None:
+            self.cells.update(self.cell_moments(df))
+        self._precomputed = {}
+        self._lock = threading.Lock()
+
+    def values(self, df):
+        return df[self.columns].to_numpy(dtype=float)
+
+    def cell_moments(self, df):
+        # One matrix product per (Year, Region) cell over its rows
+        values = self.values(df)
+        keys = pd.MultiIndex.from_arrays([df[YEAR_COLUMN].astype(int),
+                                          df[REGION_COLUMN].astype(object)])
+        codes, cells = pd.factorize(keys)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(cells) + 1))
+        return {
+            cell: CoMoments.from_values(values[order[bounds[i]:bounds[i + 1]]], self.shift)
+            for i, cell in enumerate(cells)
+        }
+
+    def select(self, years=None, regions=None):
+        return [cell for cell in self.cells
+                if (not years or cell[0] in years) and (not regions or cell[1] in regions)]
+
+    def frame(self, matrix):
+        return pd.DataFrame(matrix, index=self.columns, columns=self.columns)
+
+    def pearson(self, years=None, regions=None):
+        moments = CoMoments.empty(len(self.columns))
+        for cell in self.select(years, regions):
+            moments = moments + self.cells[cell]
+        return self.frame(moments.correlation())
+
+    def spearman(self, years=None, regions=None):
+        key = (self.version, tuple(self.columns), tuple(sorted(years or ())), tuple(sorted(regions or ())))
+        return SPEARMAN_CACHE.get(key, lambda: self.slice_spearman(years, regions))
+
+    def slice_spearman(self, years=None, regions=None):
+        rows = pd.Series(True, index=self.df.index)
+        if years:
+            rows &= self.df[YEAR_COLUMN].isin(years)
+        if regions:
+            rows &= self.df[REGION_COLUMN].isin(regions)
+        return self.df.loc[rows, self.columns].corr(method='spearman')
+
+    def correlation(self, method='pearson', years=None, regions=None):
+        if method not in METHODS:
+            raise ValueError(f"Unknown correlation method: {method}")
+        matrix = self._precomputed.get((method, tuple(sorted(years or ())), tuple(sorted(regions or ()))))
+        if matrix is None:
+            matrix = getattr(self, method)(years, regions)
+        return matrix
+
+    def years(self):
+        return sorted({year for year, _ in self.cells}, reverse=True)
+
+    def regions(self):
+        return sorted({region for _, region in self.cells})
+
+    def precompute(self):
+        # Overall, per year and per region, for both methods; kept, so
+        # correlation() serves these selections without recomputing
+        slices = [((), ())]
+        slices += [((year,), ()) for year in self.years()]
+        slices += [((), (region,)) for region in self.regions()]
+        matrices = {
+            (method, years, regions): self.correlation(method, years, regions)
+            for method in METHODS for years, regions in slices
+        }
+        with self._lock:
+            self._precomputed.update(matrices)
+        return matrices
+
+    def appended(self, rows, df=None, version=None):
+        # Engine for df + rows: only the cells the new rows land in are
+        # updated, by adding their co-moments; Spearman starts over lazily
+        # under the new version. Pass df when the combined table already exists.
+        cells = dict(self.cells)
+        for cell, moments in self.cell_moments(rows).items():
+            cells[cell] = cells[cell] + moments if cell in cells else moments
+        if df is None:
+            df = pd.concat([self.df, rows], ignore_index=True)
+        return CorrelationEngine(df, self.columns, self.shift, cells, version)
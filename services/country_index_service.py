@@ -0,0 +1,38 @@
+import base64
+
+import numpy as np
+import pandas as pd
+
+# Map attributes travel as typed columns aligned with the GeoJSON feature
+# order. Scores are rounded to 2 decimals, so they fit an Int32 in hundredths
+# without any float32 rounding showing up in tooltips.
+SCORE_SCALE = 100
+MISSING_SCORE = np.iinfo(np.int32).min
+MISSING_RANK = -1
+
+
+def country_index(df, column, rank_column):
+    # Country -> rounded score and rank; built once per slice by the layer cache
+    return pd.DataFrame({
+        'score': df[column].astype(float).round(2).to_numpy(),
+        'rank': df[rank_column].astype(int).to_numpy(),
+    }, index=pd.Index(df['Country'].astype(str), name='Country'))
+
+
+def encode_column(values):
+    # Little-endian bytes, base64 so they fit in the JSON the map is sent as
+    return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')
+
+
+def country_columns(index, positions, missing_position, order):
+    # One vectorized join of the slice onto the feature order
+    rows = pd.Index(order).get_indexer(index.index)
+    found = rows >= 0
+    rows = rows[found]
+    style = np.full(len(order), missing_position, dtype=np.uint8)
+    style[rows] = np.asarray(positions)[found]
+    score = np.full(len(order), MISSING_SCORE, dtype='<i4')
+    score[rows] = np.rint(index['score'].to_numpy()[found] * SCORE_SCALE)
+    rank = np.full(len(order), MISSING_RANK, dtype='<i2')
+    rank[rows] = index['rank'].to_numpy()[found]
+    return {'style': encode_column(style), 'score': encode_column(score), 'rank': encode_column(rank)}
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+from services.correlation_service import ANALYSIS_COLUMNS
+from services.partition_service import REGION_COLUMN, YEAR_COLUMN
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    # A named projection of data.csv: the columns read from disk and the
+    # derived structures built at load time ('layers', and 'scatter'
+    # specs with DASHBOARD_WARMUP, are warmed before a version is served)
+    name: str
+    columns: tuple = None
+    prepare: tuple = ()
+
+
+DATASETS = {
+    'dashboard': DatasetSpec('dashboard', prepare=('partitions', 'scales', 'trends', 'layers', 'scatter')),
+    'analysis': DatasetSpec('analysis', ('Country', YEAR_COLUMN, REGION_COLUMN) + ANALYSIS_COLUMNS,
+                            prepare=('correlations',)),
+}
+DEFAULT_DATASET = 'dashboard'
+
+
+def dataset_spec(name=DEFAULT_DATASET):
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset: {name}")
+    return DATASETS[name]
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from functools import cached_property
+
+import pandas as pd
+
+from services.correlation_service import CorrelationEngine
+from services.partition_service import PartitionIndex
+from services.scale_table_service import ScaleTable
+from services.time_series_service import TimeSeriesCube
+
+
+@dataclass(frozen=True, eq=False)
+class Dataset:
+    # A loaded table plus a version id computed once at load time. Cached
+    # services key on the version, so lookups never hash the rows.
+    df: pd.DataFrame
+    version: str
+
+    def __len__(self):
+        return len(self.df)
+
+    @cached_property
+    def partitions(self):
+        # (Year, Region) slices of df, built on first use
+        return PartitionIndex(self.df)
+
+    @cached_property
+    def scales(self):
+        # Decile thresholds for every indicator x year x region slice
+        return ScaleTable(self.df)
+
+    def use_scales(self, scales):
+        # A table derived from the previous version instead of computing one
+        self.__dict__['scales'] = scales
+
+    def use_correlations(self, correlations):
+        self.__dict__['correlations'] = correlations
+
+    @cached_property
+    def correlations(self):
+        # Correlation matrices for the Analysis page
+        return CorrelationEngine(self.df, version=self.version)
+
+    @cached_property
+    def trends(self):
+        # Country x year cube of every indicator for trend charts and sparklines
+        return TimeSeriesCube(self.df)
+
+
+def dataset_key(dataset):
+    return dataset.version
+
+
+HASH_FUNCS = {Dataset: dataset_key}
@@ -1,12 +1,15 @@
 import streamlit as st
 
-@st.cache_data
-def filter_data(df, year, region, start, end, entity_name):
-    filtered_df = df.loc[(df['Year'] == year) &
-                         (df[entity_name] >= start) &
-                         (df[entity_name] <= end)]
-    if region and region != 'All':
-        filtered_df = filtered_df.loc[filtered_df['Region'] == region]
-        
-    return filtered_df
+from services.dataset_service import HASH_FUNCS
+from services.instrumentation_service import instrument
 
+
+def slice_data(dataset, year, region, start, end, entity_name):
+    # Binary searches within the pre-built (Year, Region) partition
+    return dataset.partitions.query(year, region, entity_name, start, end)
+
+
+@instrument('filter_data')
+@st.cache_data(hash_funcs=HASH_FUNCS)
+def filter_data(dataset, year, region, start, end, entity_name):
+    return slice_data(dataset, year, region, start, end, entity_name)
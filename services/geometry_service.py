@@ -0,0 +1,105 @@
+import json
+import os
+from functools import lru_cache
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import streamlit as st
+
+from services.memory_service import record_memory
+from services.region_service import ZOOM_LEVELS
+from services.snapshot_service import HASH_KEY, file_digest
+
+GEOJSON_FILE = "data/countries.geo.json"
+GEOMETRY_DIR = "data/geometry"
+CRS = "EPSG:4326"
+# Simplification tolerance in screen pixels at the level's zoom
+PIXEL_TOLERANCE = 0.5
+TILE_SIZE = 256
+
+
+def level_path(zoom, geometry_dir=GEOMETRY_DIR):
+    return os.path.join(geometry_dir, f"countries_z{zoom}.feather")
+
+
+def level_tolerance(zoom):
+    # Degrees covered by one pixel of a web-mercator tile at this zoom
+    return PIXEL_TOLERANCE * 360 / (TILE_SIZE * 2 ** zoom)
+
+
+def pick_level(zoom, levels=ZOOM_LEVELS):
+    # The coarsest level that still has enough detail for the requested zoom
+    if zoom is None:
+        return max(levels)
+    finer = [level for level in levels if level >= zoom]
+    return min(finer) if finer else max(levels)
+
+
+def write_level(gdf, path, digest):
+    df = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    df['geometry'] = gdf.geometry.to_wkb()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[HASH_KEY] = digest.encode()
+    table = table.replace_schema_metadata(metadata)
+    feather.write_feather(table, path, compression='uncompressed')
+
+
+def read_level(path, digest):
+    # Returns None when the level is missing or was built from another GeoJSON
+    import geopandas as gpd
+    if not os.path.exists(path):
+        return None
+    with pa.memory_map(path, 'r') as source:
+        reader = pa.ipc.open_file(source)
+        stored = (reader.schema.metadata or {}).get(HASH_KEY)
+        if stored is None or stored.decode() != digest:
+            return None
+        df = reader.read_all().to_pandas()
+    geometry = gpd.GeoSeries.from_wkb(df.pop('geometry'), crs=CRS)
+    return gpd.GeoDataFrame(df, geometry=geometry, crs=CRS)
+
+
+def build_geometry_cache(source=GEOJSON_FILE, geometry_dir=GEOMETRY_DIR, levels=ZOOM_LEVELS):
+    import geopandas as gpd
+    os.makedirs(geometry_dir, exist_ok=True)
+    digest = file_digest(source)
+    geo_data = gpd.read_file(source).to_crs(CRS)
+    paths = []
+    for zoom in levels:
+        simplified = geo_data.geometry.simplify(level_tolerance(zoom), preserve_topology=True)
+        path = level_path(zoom, geometry_dir)
+        write_level(geo_data.set_geometry(simplified), path, digest)
+        paths.append(path)
+    return paths
+
+
+@lru_cache(maxsize=None)
+def geometry_version():
+    # Versioned apart from the table, so derived map layers key on both
+    return file_digest(GEOJSON_FILE)[:16]
+
+
+@lru_cache(maxsize=2)
+def read_country_order(version):
+    with open(GEOJSON_FILE) as f:
+        return tuple(feature['properties']['name'] for feature in json.load(f)['features'])
+
+
+def country_order():
+    # Feature order of the GeoJSON, which the geometry levels and vector tiles
+    # keep; map attribute columns are aligned with it. Read without geopandas.
+    return read_country_order(geometry_version())
+
+
+@st.cache_resource
+def load_geometry(zoom=None):
+    # geopandas is imported here rather than at module level, so pages that
+    # only need the table never load it
+    import geopandas as gpd
+    path = level_path(pick_level(zoom))
+    geo_data = read_level(path, file_digest(GEOJSON_FILE))
+    if geo_data is None:
+        geo_data = gpd.read_file(GEOJSON_FILE)
+    return record_memory(f"geometry:z{pick_level(zoom)}", geometry_version(), geo_data)
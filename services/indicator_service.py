@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+
+YEARS = (2021, 2020, 2019, 2018, 2017, 2016, 2015)
+DECIMAL_RANGE = (0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1)
+
+
+@dataclass(frozen=True)
+class Indicator:
+    title: str
+    column: str
+    rank_column: str
+    key: str  # prefix of the score/rank properties on map features
+    palette: str
+    slider_options: tuple
+    slider_value: tuple
+    trend_title: str
+    scatter: bool = True
+
+
+INDICATORS = {
+    'happiness': Indicator(
+        title="World Happiness Data",
+        column='Happiness Score',
+        rank_column='Happiness Rank',
+        key='happiness',
+        palette='YlOrBr',
+        slider_options=(1, 2, 3, 4, 5, 6, 7, 8),
+        slider_value=(1, 8),
+        trend_title="Happiness Score from 2015 to 2021",
+        scatter=False,
+    ),
+    'corruption': Indicator(
+        title="Corruption",
+        column='Corruption',
+        rank_column='Corruption Rank',
+        key='corr',
+        palette='RdGy',
+        slider_options=DECIMAL_RANGE,
+        slider_value=(0, 1),
+        trend_title="Corruption from 2015 to 2021",
+    ),
+    'gni': Indicator(
+        title="Gross National Income Per Capita",
+        column='Gross National Income Per Capita',
+        rank_column='Gross National Income Per Capita Rank',
+        key='gni',
+        palette='OrRd',
+        slider_options=tuple(range(0, 96000, 1000)),
+        slider_value=(0, 95000),
+        trend_title="GDP per Capita from 2015 to 2021",
+    ),
+    'hdi': Indicator(
+        title="Human Development Index",
+        column='Human Development Index',
+        rank_column='Human Development Index Rank',
+        key='hdi',
+        palette='YlGnBu',
+        slider_options=DECIMAL_RANGE,
+        slider_value=(0, 1),
+        trend_title="Human Development Index from 2015 to 2020",
+    ),
+    'life_expectancy': Indicator(
+        title="Life Expectancy at Birth",
+        column='Life Expectancy at Birth',
+        rank_column='Life Expectancy at Birth Rank',
+        key='leb',
+        palette='PuBu',
+        slider_options=tuple(range(40, 100, 5)),
+        slider_value=(40, 95),
+        trend_title="Life Expectancy from 2015 to 2021",
+    ),
+    'maternal_mortality': Indicator(
+        title="Maternal Mortality Ratio",
+        column='Maternal Mortality Ratio (deaths per 100,000 live births)',
+        rank_column='Maternal Mortality Ratio (deaths per 100,000 live births) Rank',
+        key='mmr',
+        palette='YlOrRd',
+        slider_options=tuple(range(0, 1300, 100)),
+        slider_value=(0, 1200),
+        trend_title="Maternal Mortality Ratio (deaths per 100,000) from 2015 to 2021",
+    ),
+    'education_inequality': Indicator(
+        title="Inequality in education",
+        column='Inequality in eduation',
+        rank_column='Inequality in eduation Rank',
+        key='iie',
+        palette='YlGnBu',
+        slider_options=tuple(range(0, 60, 5)),
+        slider_value=(0, 55),
+        trend_title="Inequality in eduation from 2015 to 2021",
+    ),
+    'schooling': Indicator(
+        title="Mean Years of Schooling",
+        column='Mean Years of Schooling',
+        rank_column='Mean Years of Schooling Rank',
+        key='mys',
+        palette='BuPu',
+        slider_options=tuple(range(0, 16)),
+        slider_value=(0, 15),
+        trend_title="Mean year of Schooling from 2015 to 2021",
+    ),
+    'gender_inequality': Indicator(
+        title="Gender Inequality Index",
+        column='Gender Inequality Index',
+        rank_column='Gender Inequality Index Rank',
+        key='gii',
+        palette='YlGnBu',
+        slider_options=(0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9),
+        slider_value=(0, 0.9),
+        trend_title="Gender Inequality Index from 2015 to 2021",
+    ),
+    'co2': Indicator(
+        title="Carbon dioxide emissions per capita (production) (tonnes)",
+        column='Carbon dioxide emissions per capita (production) (tonnes)',
+        rank_column='Carbon dioxide emissions per capita (production) (tonnes) Rank',
+        key='cde',
+        palette='PuBu',
+        slider_options=tuple(range(0, 50, 5)),
+        slider_value=(0, 45),
+        trend_title="Carbon dioxide emmission per capita from 2015 to 2021",
+    ),
+}
+
+HAPPINESS = INDICATORS['happiness']
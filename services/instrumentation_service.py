@@ -0,0 +1,238 @@
+import functools
+import http.server
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+import streamlit as st
+
+from services.memory_service import memory_report
+
+# Opt-in: set DASHBOARD_INSTRUMENT=1 to record timings. DASHBOARD_METRICS_FILE
+# and DASHBOARD_METRICS_PORT additionally export the aggregated histograms.
+ENABLED = os.environ.get('DASHBOARD_INSTRUMENT', '') not in ('', '0')
+METRICS_FILE = os.environ.get('DASHBOARD_METRICS_FILE')
+METRICS_PORT = os.environ.get('DASHBOARD_METRICS_PORT')
+
+QUANTILES = (0.5, 0.95, 0.99)
+HISTORY = 10000
+
+# Per stage: recent durations in ms, shared by all sessions
+DURATIONS = defaultdict(lambda: deque(maxlen=HISTORY))
+PAYLOADS = defaultdict(lambda: deque(maxlen=HISTORY))
+CACHES = {}
+_lock = threading.Lock()
+_local = threading.local()
+_server = None
+
+
+class Rerun:
+    # What one script run spent, in call order
+
+    def __init__(self, page):
+        self.page = page
+        self.stages = []
+        self.payloads = []
+        self.cache_stats = {name: cache.stats() for name, cache in CACHES.items()}
+
+    def cache_deltas(self):
+        deltas = {}
+        for name, cache in CACHES.items():
+            before = self.cache_stats.get(name, {'hits': 0, 'misses': 0})
+            after = cache.stats()
+            deltas[name] = {'hits': after['hits'] - before['hits'],
+                            'misses': after['misses'] - before['misses']}
+        return deltas
+
+
+def register_cache(name, cache):
+    CACHES[name] = cache
+    return cache
+
+
+def current_rerun():
+    return getattr(_local, 'rerun', None)
+
+
+def record(stage, elapsed_ms):
+    rerun = current_rerun()
+    if rerun is None:
+        return
+    rerun.stages.append((stage, elapsed_ms))
+    with _lock:
+        DURATIONS[stage].append(elapsed_ms)
+
+
+def record_payload(stage, size):
+    # size may be a callable, so measuring costs nothing when disabled
+    rerun = current_rerun()
+    if rerun is None:
+        return
+    size = size() if callable(size) else size
+    rerun.payloads.append((stage, size))
+    with _lock:
+        PAYLOADS[stage].append(size)
+
+
+@contextmanager
+def timed(stage):
+    if current_rerun() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, (time.perf_counter() - start) * 1000)
+
+
+def instrument(stage=None):
+    def decorate(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_rerun() is None:
+                return func(*args, **kwargs)
+            with timed(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def page_run(page):
+    # One Rerun per script run of a page when enabled
+    if not ENABLED:
+        yield None
+        return
+    rerun = Rerun(page)
+    _local.rerun = rerun
+    start = time.perf_counter()
+    try:
+        yield rerun
+        record('page:' + page, (time.perf_counter() - start) * 1000)
+    finally:
+        _local.rerun = None
+    finish_rerun(rerun)
+
+
+def instrument_page(page):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with page_run(page):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def summary():
+    with _lock:
+        durations = {stage: list(values) for stage, values in DURATIONS.items()}
+        payloads = {stage: list(values) for stage, values in PAYLOADS.items()}
+    stages = {}
+    for stage, values in sorted(durations.items()):
+        quantiles = np.quantile(values, QUANTILES)
+        stages[stage] = {
+            'count': len(values),
+            'sum_ms': float(np.sum(values)),
+            **{f"p{round(q * 100)}_ms": float(v) for q, v in zip(QUANTILES, quantiles)},
+        }
+    for stage, values in sorted(payloads.items()):
+        stages.setdefault(stage, {})['payload_bytes_p50'] = float(np.median(values))
+    return {
+        'stages': stages,
+        'caches': {name: cache.stats() for name, cache in CACHES.items()},
+    }
+
+
+def prometheus_text():
+    lines = [
+        '# HELP dashboard_stage_duration_ms Wall time per instrumented stage.',
+        '# TYPE dashboard_stage_duration_ms summary',
+    ]
+    stages = summary()['stages']
+    for stage, stats in stages.items():
+        if 'count' not in stats:
+            continue
+        for q in QUANTILES:
+            lines.append(f'dashboard_stage_duration_ms{{stage="{stage}",quantile="{q}"}} '
+                         f'{stats[f"p{round(q * 100)}_ms"]:.3f}')
+        lines.append(f'dashboard_stage_duration_ms_sum{{stage="{stage}"}} {stats["sum_ms"]:.3f}')
+        lines.append(f'dashboard_stage_duration_ms_count{{stage="{stage}"}} {stats["count"]}')
+    lines += [
+        '# HELP dashboard_cache_lookups_total Cache lookups by result.',
+        '# TYPE dashboard_cache_lookups_total counter',
+    ]
+    for name, cache in CACHES.items():
+        stats = cache.stats()
+        lines.append(f'dashboard_cache_lookups_total{{cache="{name}",result="hit"}} {stats["hits"]}')
+        lines.append(f'dashboard_cache_lookups_total{{cache="{name}",result="miss"}} {stats["misses"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def export_summary(path):
+    with open(path, 'w') as f:
+        json.dump(summary(), f, indent=2)
+    return path
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port):
+    # One /metrics endpoint per process, next to the Streamlit server
+    global _server
+    with _lock:
+        if _server is None:
+            _server = http.server.ThreadingHTTPServer(('127.0.0.1', int(port)), MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+    return _server
+
+
+def finish_rerun(rerun):
+    if METRICS_FILE:
+        export_summary(METRICS_FILE)
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    debug_sidebar(rerun)
+
+
+def memory_rows():
+    return [{'name': entry['name'], 'version': entry['version'], 'MB': round(entry['bytes'] / 2 ** 20, 2)}
+            for entry in memory_report()]
+
+
+def debug_sidebar(rerun):
+    with st.sidebar.expander('Performance', expanded=False):
+        st.caption(f"This rerun of {rerun.page}")
+        st.table([{'stage': stage, 'ms': round(ms, 2)} for stage, ms in rerun.stages])
+        if rerun.payloads:
+            st.table([{'payload': stage, 'bytes': size} for stage, size in rerun.payloads])
+        st.table([{'cache': name, **delta} for name, delta in rerun.cache_deltas().items()])
+        st.caption('Loaded data')
+        st.table(memory_rows())
+        st.caption('All reruns in this process')
+        st.table([{'stage': stage, **{key: round(value, 2) for key, value in stats.items()}}
+                  for stage, stats in summary()['stages'].items()])
+        st.download_button('Prometheus metrics', prometheus_text(), file_name='metrics.txt')
+        st.download_button('Summary JSON', json.dumps(summary(), indent=2), file_name='metrics.json')
@@ -0,0 +1,192 @@
+import json
+from functools import lru_cache
+
+import numpy as np
+from branca.utilities import color_brewer
+
+from services.filter_data_service import filter_data
+from services.geometry_service import country_order, geometry_version, load_geometry
+from services.indicator_service import INDICATORS, YEARS
+from services.region_service import ZOOM_LEVELS, region_zoom
+from services.set_scale_service import get_scale
+from services.country_index_service import (MISSING_SCORE, SCORE_SCALE, country_columns, country_index,
+                                            encode_column)
+from services.cache_service import LRUCache
+from services.instrumentation_service import instrument, register_cache
+from services.tile_service import use_tiles
+from services.time_series_service import MOVING_WINDOW
+
+LAYER_CACHE_SIZE = 4096
+LAYER_CACHE = register_cache('layers', LRUCache(LAYER_CACHE_SIZE))
+# Tooltip columns taken from trend_values
+TREND_COLUMNS = ('trend', 'change', 'average')
+GEOMETRY_CACHE = register_cache('geometry', LRUCache(len(ZOOM_LEVELS) + 1))
+# Countries without data are filled black, as folium.Choropleth does
+NAN_FILL_COLOR = '#000000'
+# The old white overlay (10% opacity) and its black hover (50%) are baked
+# into the fill colors so a single GeoJson layer renders the same map
+OVERLAY_OPACITY = 0.1
+HIGHLIGHT_OPACITY = 0.5
+LINE_COLOR = '#000000'
+LINE_OPACITY = 0.2
+
+
+@lru_cache(maxsize=None)
+def palette_colors(palette, n):
+    # color_brewer interpolates in pure Python, so compute each palette once
+    return color_brewer(palette, n=n)
+
+
+def blend(color, other, weight):
+    mixed = [
+        round((1 - weight) * int(color[i:i + 2], 16) + weight * int(other[i:i + 2], 16))
+        for i in (1, 3, 5)
+    ]
+    return '#' + ''.join(f"{channel:02x}" for channel in mixed)
+
+
+# Only the fill color differs between countries; the client adds it to these
+FILL_STYLE = {'fillOpacity': 1, 'color': LINE_COLOR, 'opacity': LINE_OPACITY, 'weight': 1}
+HIGHLIGHT_STYLE = {'fillOpacity': 1, 'color': LINE_COLOR, 'weight': 0.1}
+
+
+@lru_cache(maxsize=None)
+def fill_color(fill):
+    return blend(fill, '#ffffff', OVERLAY_OPACITY)
+
+
+@lru_cache(maxsize=None)
+def highlight_color(fill):
+    return blend(fill, '#000000', HIGHLIGHT_OPACITY)
+
+
+def geometry_features(zoom):
+    # Parsed once per geometry level; every layer shares these geometry dicts
+    return GEOMETRY_CACHE.get((geometry_version(), zoom),
+                              lambda: json.loads(load_geometry(zoom).to_json())['features'])
+
+
+def color_positions(values, scale, palette):
+    edges = np.asarray(scale, dtype=float)
+    colors = palette_colors(palette, len(edges) - 1)
+    # Same right-inclusive last bin as folium.Choropleth
+    digitize_edges = edges.copy()
+    digitize_edges[-1] = np.nextafter(digitize_edges[-1], np.inf)
+    return colors, np.clip(np.digitize(values, digitize_edges) - 1, 0, len(colors) - 1)
+
+
+def level_features(zoom):
+    # Outlines with their names only; everything else comes from the columns
+    return GEOMETRY_CACHE.get((geometry_version(), 'names', zoom), lambda: [
+        {'type': 'Feature', 'id': feature.get('id'),
+         'properties': {'name': feature['properties']['name']}, 'geometry': feature['geometry']}
+        for feature in geometry_features(zoom)
+    ])
+
+
+def build_trend(trends, indicator, year):
+    order = country_order()
+
+    def column(measure, years=None):
+        return encode_column(trends.encoded_series(indicator.column, order, MISSING_SCORE, SCORE_SCALE,
+                                                   measure, years))
+
+    previous = trends.years[trends.years < year]
+    return {
+        'years': trends.years.tolist(),
+        'trend': column('value'),
+        'change': column('delta', [year]),
+        'average': column('moving_average', [year]),
+        'aliases': [f"Change since {previous[-1]}" if len(previous) else "Change",
+                    f"{MOVING_WINDOW}-year average"],
+    }
+
+
+def trend_values(dataset, indicator, year):
+    # Every country's series of the indicator for the tooltip sparklines, in
+    # hundredths, years oldest first, with its change since the previous year
+    # and its trailing mean at this year; the same for every region
+    key = (dataset.version, geometry_version(), 'trend', indicator.key, year)
+    return LAYER_CACHE.get(key, lambda: build_trend(dataset.trends, indicator, year))
+
+
+def build_values(df, scale, indicator, trend=None):
+    # Style index, score and rank per country as typed columns in the
+    # GeoJSON feature order, plus the few fill colors they index into
+    index = country_index(df, indicator.column, indicator.rank_column)
+    # Binned on the raw values, as folium.Choropleth does; only the tooltip
+    # score is rounded
+    colors, positions = color_positions(df[indicator.column].to_numpy(dtype=float), scale, indicator.palette)
+    fills = colors + [NAN_FILL_COLOR]
+    columns = country_columns(index, positions, len(colors), country_order())
+    aliases = ['Country: ', indicator.rank_column, indicator.column]
+    if trend:
+        columns.update({name: trend[name] for name in TREND_COLUMNS})
+        aliases += trend['aliases']
+    return {
+        'columns': columns,
+        'years': trend['years'] if trend else None,
+        'fills': [fill_color(fill) for fill in fills],
+        'highlights': [highlight_color(fill) for fill in fills],
+        'legend': {'colors': colors, 'thresholds': list(scale), 'caption': indicator.column},
+        'aliases': aliases,
+    }
+
+
+def build_layer(df, scale, indicator, zoom, trend=None):
+    # The GeoJSON backend: the same columns plus this zoom level's outlines
+    return {**build_values(df, scale, indicator, trend), 'features': level_features(zoom)}
+
+
+def empty_values():
+    # Every country unfilled, until the first update arrives
+    return {'columns': None, 'years': None, 'fills': [fill_color(NAN_FILL_COLOR)],
+            'highlights': [highlight_color(NAN_FILL_COLOR)], 'aliases': ['', '', ''], 'legend': None}
+
+
+@instrument('create_layer')
+def create_layer(dataset, indicator, year, region, start, end):
+    df = filter_data(dataset, year, region, start, end, indicator.column)
+    if df.empty:
+        return None
+    scale = get_scale(dataset, year, region, start, end, indicator.column)
+    return build_layer(df, scale, indicator, region_zoom(region), trend_values(dataset, indicator, year))
+
+
+@instrument('get_layer')
+def get_layer(dataset, indicator, year, region, start, end):
+    # Keyed by data versions and widget values only, so lookups never hash data
+    key = (dataset.version, geometry_version(), indicator.key, year, region, start, end)
+    return LAYER_CACHE.get(key, lambda: create_layer(dataset, indicator, year, region, start, end))
+
+
+@instrument('create_values')
+def create_values(dataset, indicator, year, region, start, end):
+    df = filter_data(dataset, year, region, start, end, indicator.column)
+    if df.empty:
+        return None
+    scale = get_scale(dataset, year, region, start, end, indicator.column)
+    return build_values(df, scale, indicator, trend_values(dataset, indicator, year))
+
+
+@instrument('get_values')
+def get_values(dataset, indicator, year, region, start, end):
+    # No geometry in these, so they don't depend on the geometry version
+    key = (dataset.version, 'values', indicator.key, year, region, start, end)
+    return LAYER_CACHE.get(key, lambda: create_values(dataset, indicator, year, region, start, end))
+
+
+def precompute_layers(dataset, regions, indicators=INDICATORS, years=YEARS, stop=None):
+    # Default slider range for every indicator x year x region combination,
+    # for whichever map backend is in use; returns early once stop is set
+    build = get_values if use_tiles() else get_layer
+    count = 0
+    for indicator in indicators.values():
+        start, end = indicator.slider_value
+        for year in years:
+            for region in regions:
+                if stop is not None and stop.is_set():
+                    return count
+                build(dataset, indicator, year, region, start, end)
+                count += 1
+    return count
@@ -1,15 +1,208 @@
-import streamlit as st
+import atexit
+import hashlib
+import logging
+import os
+import threading
+
 import pandas as pd
-import geopandas as gpd
 
-GEOJSON_FILE = "data/countries.geo.json"
+from services.dataset_service import Dataset
+from services.dataset_registry_service import DATASETS, DEFAULT_DATASET, dataset_spec
+from services.indicator_service import INDICATORS
+from services.geometry_service import load_geometry
+from services.memory_service import record_memory
+from services.partition_service import ALL_REGIONS, REGION_COLUMN, YEAR_COLUMN
+from services.scale_table_service import changed_rows
+from services.reload_service import RELOAD_INTERVAL, FileWatcher, VersionedStore, release_retired, retire
+from services.snapshot_service import file_digest, read_table
+
 DATA_FILE = "data/data.csv"
 REGIONS_FILE = "data/regions.csv"
+SNAPSHOT_FILE = "data/data.feather"
+# Reloads always build the default map layers before the swap.
+# DASHBOARD_WARMUP=1 also warms the first version and adds the scatter specs;
+# without it the first version's layers and specs are built on demand
+WARMUP = os.environ.get('DASHBOARD_WARMUP', '') not in ('', '0')
+
+# Current tables and regions for every session; see reload_data()
+STORE = VersionedStore()
+_watcher = None
+_watcher_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def load_data(use_snapshot=True):
+    return load_geometry(), load_dataset(DEFAULT_DATASET, use_snapshot), load_regions()
+
+
+# Geometry, tables and regions are cached and versioned separately, so a
+# page only pays for what it uses and each one can change on its own.
+# Call these once per rerun and pass the result down: after a reload the
+# next call returns the new version.
+
+def load_dataset(name=DEFAULT_DATASET, use_snapshot=True):
+    start_watcher()
+    return STORE.get(('dataset', name, use_snapshot), lambda: first_load(name, use_snapshot))
+
+
+def load_regions():
+    start_watcher()
+    return STORE.get(('regions',), read_regions).regions
+
+
+def read_dataset(name=DEFAULT_DATASET, use_snapshot=True, previous=None):
+    # Only the registered dataset's columns are read from disk
+    spec = dataset_spec(name)
+    df = read_table(DATA_FILE, SNAPSHOT_FILE, use_snapshot, spec.columns)
+    validate_table(df)
+    data = prepare_dataset(df, table_version(spec), spec, previous)
+    record_memory(f"table:{name}", data.version, data.df)
+    if 'trends' in spec.prepare:
+        record_memory(f"trends:{name}", data.version, data.trends)
+    return data
+
+
+def first_load(name=DEFAULT_DATASET, use_snapshot=True):
+    data = read_dataset(name, use_snapshot)
+    if WARMUP:
+        warm_dataset(data, dataset_spec(name))
+    return data
+
+
+class Regions:
+    # The region list with its version, so it can be swapped like a dataset
+
+    def __init__(self, regions, version):
+        self.regions = regions
+        self.version = version
+
+
+def read_regions():
+    regions = pd.read_csv(REGIONS_FILE)
+    validate_regions(regions)
+    record_memory('regions', regions_version(), regions)
+    return Regions(list(regions['Regions']), regions_version())
+
+
+def validate_table(df):
+    # A bad file must never replace a good version, so check what pages rely on
+    if df.empty:
+        raise ValueError(f"{DATA_FILE} has no rows")
+    missing = [column for column in ('Country', YEAR_COLUMN, REGION_COLUMN) if column not in df]
+    if missing:
+        raise ValueError(f"{DATA_FILE} is missing columns: {', '.join(missing)}")
+    if df[['Country', YEAR_COLUMN, REGION_COLUMN]].isna().any().any():
+        raise ValueError(f"{DATA_FILE} has rows without Country, Year or Region")
+    if df.duplicated(['Country', YEAR_COLUMN]).any():
+        raise ValueError(f"{DATA_FILE} has duplicate Country/Year rows")
+
+
+def validate_regions(regions):
+    if 'Regions' not in regions or regions['Regions'].isna().any():
+        raise ValueError(f"{REGIONS_FILE} needs a Regions column without blanks")
+    if ALL_REGIONS not in set(regions['Regions']):
+        raise ValueError(f"{REGIONS_FILE} has no '{ALL_REGIONS}' entry")
+
+
+def prepare_dataset(df, version, spec=DATASETS[DEFAULT_DATASET], previous=None):
+    # previous is the version being replaced, if any; what can be updated
+    # from it is, the rest is built from scratch
+    data = Dataset(df, version)
+    changed = None
+    if previous is not None and list(previous.df.columns) == list(df.columns):
+        changed = changed_rows(previous.df, df)
+    # Build what the dataset's pages use now rather than on the first request
+    if 'partitions' in spec.prepare:
+        data.partitions.sort_columns([indicator.column for indicator in INDICATORS.values()
+                                      if indicator.column in df])
+    if 'scales' in spec.prepare:
+        if changed is not None:
+            # Only the (Year, Region) cells touched by the edit are recomputed
+            data.use_scales(previous.scales.updated(df, changed))
+        else:
+            data.scales
+    if 'trends' in spec.prepare:
+        data.trends
+    if 'correlations' in spec.prepare:
+        if changed is not None and len(changed) == len(df) - len(previous.df):
+            # Rows were only added: their co-moments are added to the old cells
+            data.use_correlations(previous.correlations.appended(changed, df, version))
+        data.correlations.precompute()
+    return data
+
+
+def warm_dataset(data, spec, stop=None):
+    # Default-range map layers for the new version, before anyone sees it;
+    # scatter specs take several times longer, so only with DASHBOARD_WARMUP.
+    # stop lets a shutdown interrupt either.
+    if 'layers' in spec.prepare:
+        from services.layer_cache_service import precompute_layers
+        precompute_layers(data, load_regions(), stop=stop)
+    if 'scatter' in spec.prepare and WARMUP:
+        from graphs.scatter_plot import precompute_scatter_specs
+        precompute_scatter_specs(data, load_regions(), stop=stop)
+
+
+def reload_data(changed):
+    # Runs on the watcher thread. Each replacement is loaded, validated and
+    # warmed while sessions keep using the current version, then swapped in;
+    # a file that fails validation leaves the current version in place.
+    for key in STORE.keys():
+        kind = key[0]
+        if kind == 'regions' and REGIONS_FILE in changed:
+            fresh = read_regions()
+        elif kind == 'dataset' and DATA_FILE in changed:
+            _, name, use_snapshot = key
+            fresh = read_dataset(name, use_snapshot, previous=STORE.current(key))
+            warm_dataset(fresh, dataset_spec(name), _watcher.stopped if _watcher else None)
+        else:
+            continue
+        old = STORE.swap(key, fresh)
+        if old is not None and old.version != fresh.version:
+            retire(old)
+        logger.info("Loaded %s version %s", '/'.join(map(str, key)), fresh.version)
+
+
+def release_data():
+    from services.filter_data_service import filter_data
+    # st.cache_data can only be cleared as a whole; the current version's
+    # slices are cheap to recompute
+    release_retired(STORE, extra=(filter_data.clear,))
+
+
+def on_change(changed):
+    try:
+        reload_data(changed)
+    except (OSError, ValueError, KeyError) as error:
+        logger.warning("Keeping the current data, reload failed: %s", error)
+
+
+def start_watcher(interval=RELOAD_INTERVAL):
+    global _watcher
+    if interval <= 0 or _watcher is not None:
+        return _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = FileWatcher((DATA_FILE, REGIONS_FILE), on_change, interval, on_tick=release_data)
+            _watcher.start()
+            atexit.register(stop_watcher)
+    return _watcher
+
+
+def stop_watcher(timeout=10):
+    # Ends a reload's warm-up early and waits for the thread at exit
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher.join(timeout)
+
+
+def table_version(spec=DATASETS[DEFAULT_DATASET]):
+    # Short hash of the CSV and the projection, used to key derived caches
+    digest = hashlib.sha256(file_digest(DATA_FILE).encode())
+    digest.update(repr((spec.name, spec.columns)).encode())
+    return digest.hexdigest()[:16]
 
 
-@st.cache_resource
-def load_data():
-    geo_data = gpd.read_file(GEOJSON_FILE)
-    data = pd.read_csv(DATA_FILE)
-    regions = list(pd.read_csv(REGIONS_FILE)['Regions'])
-    return geo_data, data, regions
\ No newline at end of file
+def regions_version():
+    return file_digest(REGIONS_FILE)[:16]
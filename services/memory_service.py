@@ -0,0 +1,34 @@
+import threading
+
+import pandas as pd
+
+# What each loader is holding, for the instrumentation sidebar and benchmarks
+MEMORY = {}
+_lock = threading.Lock()
+
+
+def frame_bytes(df):
+    size = int(df.memory_usage(deep=True).sum())
+    if hasattr(df, 'geometry'):
+        # Shapely objects count as pointers above; add their coordinates
+        import shapely
+        size += int(shapely.get_num_coordinates(df.geometry.values).sum()) * 16
+    return size
+
+
+def record_memory(name, version, obj):
+    nbytes = frame_bytes(obj) if isinstance(obj, pd.DataFrame) else getattr(obj, 'nbytes', 0)
+    with _lock:
+        MEMORY[name] = {'name': name, 'version': version, 'bytes': nbytes}
+    return obj
+
+
+def forget_memory(name):
+    with _lock:
+        MEMORY.pop(name, None)
+
+
+def memory_report():
+    with _lock:
+        # Copies, so callers can't change the registry
+        return sorted((dict(entry) for entry in MEMORY.values()), key=lambda entry: entry['name'])
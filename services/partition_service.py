@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+YEAR_COLUMN = 'Year'
+REGION_COLUMN = 'Region'
+ALL_REGIONS = 'All'
+
+
+class Partition:
+    # Row positions of one (year, region) slice, plus each metric's non-null
+    # values sorted once so a range filter is two binary searches
+
+    def __init__(self, df, positions):
+        self.df = df
+        self.positions = positions
+        self._sorted = {}
+        self._lock = threading.Lock()
+
+    def sorted_column(self, column):
+        entry = self._sorted.get(column)
+        if entry is None:
+            values = self.df[column].to_numpy()[self.positions]
+            keep = ~pd.isna(values)
+            order = np.argsort(values[keep], kind='stable')
+            entry = (values[keep][order], self.positions[keep][order])
+            with self._lock:
+                self._sorted.setdefault(column, entry)
+        return entry
+
+    def value_bounds(self, values, start, end):
+        # Compare in the column dtype, as the boolean masks did
+        start, end = np.array([start, end]).astype(values.dtype, copy=False)
+        return (np.searchsorted(values, start, side='left'),
+                np.searchsorted(values, end, side='right'))
+
+    def range_positions(self, column, start, end):
+        values, positions = self.sorted_column(column)
+        lo, hi = self.value_bounds(values, start, end)
+        # Back to table order so slices match the old mask filter row for row
+        return np.sort(positions[lo:hi])
+
+
+class PartitionIndex:
+
+    def __init__(self, df):
+        self.df = df
+        self.partitions = {}
+        years = df[YEAR_COLUMN].to_numpy()
+        regions = df[REGION_COLUMN].astype(object).to_numpy()
+        for year in pd.unique(years):
+            in_year = np.flatnonzero(years == year)
+            self.partitions[(year, ALL_REGIONS)] = Partition(df, in_year)
+            for region in pd.unique(regions[in_year]):
+                positions = in_year[regions[in_year] == region]
+                self.partitions[(year, region)] = Partition(df, positions)
+
+    def partition(self, year, region):
+        return self.partitions.get((year, region or ALL_REGIONS))
+
+    def sort_columns(self, columns):
+        for partition in self.partitions.values():
+            for column in columns:
+                partition.sorted_column(column)
+        return self
+
+    def query(self, year, region, column, start, end):
+        partition = self.partition(year, region)
+        if partition is None:
+            return self.df.iloc[:0]
+        return self.df.iloc[partition.range_positions(column, start, end)]
@@ -0,0 +1,48 @@
+REGION_FOCUS = {
+    "": [17.51, 22],
+    'Australia and New Zealand': [-28, 145],
+    'Central Asia': [46, 60],
+    'Eastern Asia': [33, 105],
+    'Eastern Europe': [17.51, 22],
+    'Latin America and the Caribbean': [3, -67],
+    'Melanesia': [17, 22],
+    'Micronesia': [17, 22],
+    'Northern Africa': [31, 12],
+    'Northern America': [51, -115],
+    'Northern Europe': [66, 16],
+    'Polynesia': [17, 22],
+    'South-eastern Asia': [1.8, 114],
+    'Southern Asia': [18, 77],
+    'Southern Europe': [43, 10],
+    'Sub-Saharan Africa': [1, 19],
+    'Western Asia': [32, 39.6],
+    'Western Europe': [48, 6]
+}
+
+REGION_ZOOM = {
+    "": 1,
+    'Australia and New Zealand': 2,
+    'Central Asia': 3,
+    'Eastern Asia': 2,
+    'Eastern Europe': 2,
+    'Latin America and the Caribbean': 2,
+    'Melanesia': 2,
+    'Micronesia': 2,
+    'Northern Africa': 3,
+    'Northern America': 2,
+    'Northern Europe': 2,
+    'Polynesia': 2,
+    'South-eastern Asia': 3,
+    'Southern Asia': 3,
+    'Southern Europe': 4,
+    'Sub-Saharan Africa': 3,
+    'Western Asia': 3,
+    'Western Europe': 3
+}
+
+ZOOM_LEVELS = tuple(sorted(set(REGION_ZOOM.values())))
+
+
+def region_zoom(region):
+    # Regions without an entry (e.g. 'All') are shown at world zoom
+    return REGION_ZOOM.get(region, REGION_ZOOM[""])
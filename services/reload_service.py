@@ -0,0 +1,135 @@
+import logging
+import os
+import threading
+import weakref
+
+from services.instrumentation_service import CACHES
+
+# Seconds between checks of the data files; 0 turns hot reload off
+RELOAD_INTERVAL = float(os.environ.get('DASHBOARD_RELOAD_INTERVAL', '5'))
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedStore:
+    # The current value per key, shared by every session. A reload builds
+    # the replacement off to the side and swaps the reference in one step,
+    # so a rerun sees either the old version or the new one, never a mix.
+
+    def __init__(self):
+        self._current = {}
+        self._lock = threading.Lock()
+        # Reentrant: loading a dataset may load the regions it is warmed for
+        self._loading = threading.RLock()
+
+    def get(self, key, load):
+        value = self._current.get(key)
+        if value is None:
+            with self._loading:
+                value = self._current.get(key)
+                if value is None:
+                    value = load()
+                    with self._lock:
+                        self._current[key] = value
+        return value
+
+    def current(self, key):
+        with self._lock:
+            return self._current.get(key)
+
+    def keys(self):
+        with self._lock:
+            return list(self._current)
+
+    def swap(self, key, value):
+        with self._lock:
+            old = self._current.get(key)
+            self._current[key] = value
+        return old
+
+    def versions(self):
+        with self._lock:
+            return {getattr(value, 'version', None) for value in self._current.values()}
+
+
+def file_stat(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher(threading.Thread):
+    # Polls file stats. A change is reported once the file has stopped
+    # changing for one interval, so a half-written CSV is never loaded.
+
+    def __init__(self, paths, on_change, interval=RELOAD_INTERVAL, on_tick=None):
+        super().__init__(name='data-watcher', daemon=True)
+        self.paths = tuple(paths)
+        self.on_change = on_change
+        self.on_tick = on_tick
+        self.interval = interval
+        self.seen = {path: file_stat(path) for path in self.paths}
+        self.pending = {}
+        self.stopped = threading.Event()
+
+    def poll(self):
+        changed = []
+        for path in self.paths:
+            stat = file_stat(path)
+            if stat == self.seen[path]:
+                self.pending.pop(path, None)
+            elif stat is not None and self.pending.get(path) == stat:
+                self.seen[path] = stat
+                del self.pending[path]
+                changed.append(path)
+            else:
+                self.pending[path] = stat
+        return changed
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                changed = self.poll()
+                if changed:
+                    self.on_change(changed)
+                if self.on_tick:
+                    self.on_tick()
+            except Exception:
+                logger.exception("Reloading %s failed", ', '.join(self.paths))
+
+    def stop(self):
+        self.stopped.set()
+
+
+# Versions swapped out of a store wait here until the last rerun using them
+# finishes, then the watcher drops everything cached under them
+RETIRED = []
+_retired_lock = threading.Lock()
+
+
+def retire(value):
+    version = value.version
+
+    def released():
+        with _retired_lock:
+            RETIRED.append(version)
+    weakref.finalize(value, released)
+
+
+def release_retired(store, extra=()):
+    with _retired_lock:
+        retired = RETIRED[:]
+        RETIRED.clear()
+    live = store.versions()
+    for version in retired:
+        if version in live:
+            # Reloaded back to identical content; the entries are current again
+            continue
+        evicted = sum(cache.evict(lambda key: isinstance(key, tuple) and version in key)
+                      for cache in CACHES.values())
+        for clear in extra:
+            clear()
+        logger.info("Released data version %s (%s cache entries)", version, evicted)
+    return len(retired)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from services.indicator_service import DECIMAL_RANGE, INDICATORS
+from services.partition_service import ALL_REGIONS, REGION_COLUMN, YEAR_COLUMN
+
+DECILES = DECIMAL_RANGE
+# Each indicator's scale is precomputed for its default slider range
+SCALE_RANGES = {indicator.column: indicator.slider_value for indicator in INDICATORS.values()}
+
+
+def sorted_quantiles(values, quantiles=DECILES):
+    # Linear interpolation on already sorted values, as Series.quantile does
+    if len(values) == 0:
+        return [np.nan] * len(quantiles)
+    values = np.asarray(values, dtype=float)
+    positions = np.asarray(quantiles) * (len(values) - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.ceil(positions).astype(int)
+    fraction = positions - lower
+    return (values[lower] + (values[upper] - values[lower]) * fraction).tolist()
+
+
+def in_range(df, ranges):
+    # Values outside a column's range become NaN, which quantile skips
+    return pd.DataFrame({
+        column: df[column].where((df[column] >= start) & (df[column] <= end))
+        for column, (start, end) in ranges.items()
+    })
+
+
+def grouped_quantiles(values, keys):
+    # One groupby pass over every column; rows of the result are
+    # (group..., quantile), so each group owns len(DECILES) rows
+    table = values.groupby(keys, observed=True).quantile(list(DECILES))
+    groups = table.index.droplevel(-1)[::len(DECILES)]
+    blocks = table.to_numpy(dtype=float).reshape(len(groups), len(DECILES), len(values.columns))
+    return groups, blocks
+
+
+def changed_rows(old, new):
+    # Rows found in only one of two versions of a table: added, removed, and
+    # both sides of an edited row, so its old and its new cell are covered
+    rows = pd.concat([old, new], ignore_index=True)
+    return rows[~rows.duplicated(keep=False)]
+
+
+class ScaleTable:
+
+    def __init__(self, df, ranges=SCALE_RANGES, scales=None):
+        self.ranges = {column: tuple(bounds) for column, bounds in ranges.items() if column in df}
+        self.scales = dict(scales or {})
+        if scales is None:
+            self.scales.update(self.compute(df))
+
+    def compute(self, df):
+        values = in_range(df, self.ranges)
+        years = df[YEAR_COLUMN].to_numpy()
+        regions = df[REGION_COLUMN].astype(object).to_numpy()
+
+        scales = {}
+        for keys, with_region in ((years, False), ([years, regions], True)):
+            if values.empty:
+                break
+            groups, blocks = grouped_quantiles(values, keys)
+            for group, block in zip(groups, blocks):
+                year, region = group if with_region else (group, ALL_REGIONS)
+                for column, thresholds in zip(values.columns, block.T):
+                    scales[(column, int(year), region)] = thresholds.tolist()
+        return scales
+
+    def get(self, column, year, region, start, end):
+        # None when the range is not the precomputed one for this column
+        if self.ranges.get(column) != (start, end):
+            return None
+        return self.scales.get((column, year, region or ALL_REGIONS))
+
+    def updated(self, df, changed):
+        # A table for df where only the (Year, Region) slices touched by the
+        # changed rows, and the 'All' slices of their years, are recomputed
+        years = pd.unique(changed[YEAR_COLUMN])
+        regions = set(zip(changed[YEAR_COLUMN].astype(int), changed[REGION_COLUMN].astype(object)))
+        affected = df[df[YEAR_COLUMN].isin(years)]
+        scales = {
+            key: scale for key, scale in self.scales.items()
+            if key[1] not in years or (key[2] != ALL_REGIONS and (key[1], key[2]) not in regions)
+        }
+        recomputed = self.compute(affected)
+        scales.update({
+            key: scale for key, scale in recomputed.items()
+            if key[2] == ALL_REGIONS or (key[1], key[2]) in regions
+        })
+        return ScaleTable(df, self.ranges, scales)
@@ -0,0 +1,55 @@
+import streamlit as st
+
+SELECTION_KEY = 'selected_countries'
+WIDGET_KEY = 'country_multiselect'
+LAST_CLICK_KEY = 'last_clicked_country'
+MAX_SELECTED = 20
+
+
+def session_state(state=None):
+    return st.session_state if state is None else state
+
+
+def get_selection(state=None):
+    return list(session_state(state).get(SELECTION_KEY, []))
+
+
+def set_selection(countries, state=None, limit=MAX_SELECTED):
+    # Deduplicated, in selection order, keeping only the most recent picks
+    selected = list(dict.fromkeys(country for country in countries if country))
+    session_state(state)[SELECTION_KEY] = selected[-limit:]
+    return get_selection(state)
+
+
+def add_countries(countries, state=None, limit=MAX_SELECTED):
+    return set_selection(get_selection(state) + list(countries), state, limit)
+
+
+def handle_map_click(country, state=None, limit=MAX_SELECTED):
+    # st_folium keeps returning the last click on every rerun, so only a new
+    # click adds to the selection (and a removed country stays removed)
+    state = session_state(state)
+    if not country or state.get(LAST_CLICK_KEY) == country:
+        return get_selection(state)
+    state[LAST_CLICK_KEY] = country
+    return add_countries([country], state, limit)
+
+
+def sync_from_widget():
+    set_selection(st.session_state[WIDGET_KEY])
+
+
+def country_selector(options, clicked=None):
+    state = st.session_state
+    if SELECTION_KEY not in state:
+        set_selection(options[:1])
+    if clicked in options:
+        handle_map_click(clicked)
+
+    selected = get_selection()
+    state[WIDGET_KEY] = selected
+    # Keep countries picked under another year/region selectable
+    options = list(dict.fromkeys(list(options) + selected))
+    st.multiselect('Select Countries', options, key=WIDGET_KEY,
+                   on_change=sync_from_widget, max_selections=MAX_SELECTED)
+    return get_selection()
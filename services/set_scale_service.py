@@ -1,7 +1,17 @@
-import streamlit as st
+from services.instrumentation_service import instrument
+from services.scale_table_service import DECILES, sorted_quantiles
 
-@st.cache_data
-def get_scale(df, entity):
-    myscale = (df[entity].quantile(
-        (0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1))).tolist()
-    return myscale
\ No newline at end of file
+
+@instrument('get_scale')
+def get_scale(dataset, year, region, start, end, entity):
+    # Default slider ranges come from the table built at load; any other
+    # range reads the deciles off the partition's sorted values
+    myscale = dataset.scales.get(entity, year, region, start, end)
+    if myscale is None:
+        partition = dataset.partitions.partition(year, region)
+        if partition is None:
+            return sorted_quantiles([], DECILES)
+        values, _ = partition.sorted_column(entity)
+        lo, hi = partition.value_bounds(values, start, end)
+        myscale = sorted_quantiles(values[lo:hi], DECILES)
+    return myscale
@@ -0,0 +1,79 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+DATA_FILE = "data/data.csv"
+SNAPSHOT_FILE = "data/data.feather"
+HASH_KEY = b"source_sha256"
+
+CATEGORY_COLUMNS = ['Country', 'Region']
+YEAR_COLUMN = 'Year'
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def apply_schema(df):
+    # Same dtypes whether the table came from the CSV or from the snapshot
+    df = df.copy()
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype('category')
+        elif column == YEAR_COLUMN:
+            df[column] = df[column].astype(np.int16)
+        elif column.endswith(' Rank'):
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+        elif pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = df[column].astype(np.float32)
+    return df
+
+
+def build_snapshot(csv_path=DATA_FILE, snapshot_path=SNAPSHOT_FILE):
+    df = apply_schema(pd.read_csv(csv_path))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[HASH_KEY] = file_digest(csv_path).encode()
+    table = table.replace_schema_metadata(metadata)
+    # Uncompressed so the file can be memory-mapped on load
+    feather.write_feather(table, snapshot_path, compression='uncompressed')
+    return snapshot_path
+
+
+def snapshot_digest(snapshot_path=SNAPSHOT_FILE):
+    if not os.path.exists(snapshot_path):
+        return None
+    with pa.memory_map(snapshot_path, 'r') as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    digest = metadata.get(HASH_KEY)
+    return digest.decode() if digest else None
+
+
+def read_snapshot(snapshot_path=SNAPSHOT_FILE, csv_path=DATA_FILE, columns=None):
+    # Returns None when the snapshot is missing or was built from another CSV
+    digest = snapshot_digest(snapshot_path)
+    if digest is None or digest != file_digest(csv_path):
+        return None
+    with pa.memory_map(snapshot_path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        # Columns that aren't selected are never copied out of the mapping
+        table = table.select(list(columns))
+    return table.to_pandas()
+
+
+def read_table(csv_path=DATA_FILE, snapshot_path=SNAPSHOT_FILE, use_snapshot=True, columns=None):
+    # columns=None reads every column, otherwise only those, in that order
+    data = read_snapshot(snapshot_path, csv_path, columns) if use_snapshot else None
+    if data is None:
+        data = pd.read_csv(csv_path, usecols=None if columns is None else list(columns))
+        data = apply_schema(data if columns is None else data[list(columns)])
+    return data
@@ -0,0 +1,218 @@
+import json
+import math
+import os
+import shutil
+from functools import lru_cache
+
+import numpy as np
+
+from services.geometry_service import GEOJSON_FILE, geometry_version, level_tolerance
+from services.region_service import ZOOM_LEVELS
+from services.snapshot_service import file_digest
+
+# DASHBOARD_MAP_BACKEND=tiles draws the map from pre-cut vector tiles, built
+# with `python -m scripts.build_tiles` and served by Streamlit's static file
+# server, so a rerun sends only the country -> color/value table
+MAP_BACKEND = os.environ.get('DASHBOARD_MAP_BACKEND', 'geojson')
+TILE_DIR = "static/tiles"
+TILE_URL = os.environ.get('DASHBOARD_TILE_URL', "/app/static/tiles/{z}/{x}/{y}.pbf")
+TILE_ZOOMS = tuple(range(0, max(ZOOM_LEVELS) + 2))
+TILE_LAYER = "countries"
+METADATA_FILE = "metadata.json"
+# Bumped when the tile contents change, so old tile directories are rebuilt
+TILE_SCHEMA = 2
+EXTENT = 4096
+# Geometry past the tile edge, in tile units, so strokes don't show seams
+BUFFER = 64
+MAX_LATITUDE = 85.0511287798
+
+
+@lru_cache(maxsize=None)
+def tiles_available(tile_dir, version):
+    # Tiles exist and were cut from this version of the GeoJSON
+    path = os.path.join(tile_dir, METADATA_FILE)
+    if not os.path.exists(path):
+        return False
+    with open(path) as f:
+        metadata = json.load(f)
+    return metadata.get('schema') == TILE_SCHEMA and metadata.get('source_sha256', '')[:len(version)] == version
+
+
+def use_tiles():
+    return MAP_BACKEND == 'tiles' and tiles_available(TILE_DIR, geometry_version())
+
+
+def max_tile_zoom(tile_dir=TILE_DIR):
+    with open(os.path.join(tile_dir, METADATA_FILE)) as f:
+        return max(json.load(f)['zooms'])
+
+
+# Protocol buffer encoding of the vector tile spec (vector_tile.proto v2),
+# written out by hand since only three message types are needed
+
+def varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def message_field(number, payload):
+    return varint(number << 3 | 2) + varint(len(payload)) + payload
+
+
+def varint_field(number, value):
+    return varint(number << 3) + varint(value)
+
+
+def packed_field(number, values):
+    return message_field(number, b''.join(varint(value) for value in values))
+
+
+def command(command_id, count):
+    return (command_id & 0x7) | (count << 3)
+
+
+def ring_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y) / 2
+
+
+def clean_ring(coords):
+    # Integer tile coordinates without the closing point or repeated points
+    ring = np.rint(coords[:-1]).astype(np.int64)
+    keep = np.any(ring != np.roll(ring, 1, axis=0), axis=1)
+    ring = ring[keep] if keep.any() else ring[:1]
+    return ring if len(ring) >= 3 and ring_area(ring) != 0 else None
+
+
+def polygon_rings(polygon):
+    # Exterior rings have positive area in tile coordinates (y down), holes negative
+    exterior = clean_ring(np.asarray(polygon.exterior.coords))
+    if exterior is None:
+        return []
+    rings = [exterior if ring_area(exterior) > 0 else exterior[::-1]]
+    for interior in polygon.interiors:
+        hole = clean_ring(np.asarray(interior.coords))
+        if hole is not None:
+            rings.append(hole if ring_area(hole) < 0 else hole[::-1])
+    return rings
+
+
+def encode_geometry(polygons):
+    commands = []
+    cursor = np.zeros(2, dtype=np.int64)
+    for polygon in polygons:
+        for ring in polygon_rings(polygon):
+            deltas = np.diff(np.vstack([cursor, ring]), axis=0)
+            cursor = ring[-1]
+            commands.append(command(1, 1))
+            commands += [zigzag(int(value)) for value in deltas[0]]
+            commands.append(command(2, len(ring) - 1))
+            commands += [zigzag(int(value)) for value in deltas[1:].ravel()]
+            commands.append(command(7, 1))
+    return commands
+
+
+def encode_value(value):
+    # Value message: string_value = 1, uint_value = 5
+    return message_field(1, value.encode()) if isinstance(value, str) else varint_field(5, value)
+
+
+def encode_tile(features, layer_name=TILE_LAYER, extent=EXTENT):
+    # features: (position in the GeoJSON, name, polygons in tile coordinates).
+    # The position is kept as the 'index' property, which the map's
+    # attribute columns are aligned with.
+    values = []
+    value_index = {}
+    encoded = []
+    for position, name, polygons in features:
+        geometry = encode_geometry(polygons)
+        if not geometry:
+            continue
+        tags = []
+        for key, value in enumerate((name, position)):
+            if (key, value) not in value_index:
+                value_index[(key, value)] = len(values)
+                values.append(value)
+            tags += [key, value_index[(key, value)]]
+        encoded.append(message_field(2, varint_field(1, position + 1)
+                                     + packed_field(2, tags)
+                                     + varint_field(3, 3)
+                                     + packed_field(4, geometry)))
+    if not encoded:
+        return b''
+    layer = message_field(1, layer_name.encode()) + b''.join(encoded)
+    layer += message_field(3, b'name') + message_field(3, b'index')
+    layer += b''.join(message_field(4, encode_value(value)) for value in values)
+    layer += varint_field(5, extent) + varint_field(15, 2)
+    return message_field(3, layer)
+
+
+def project(coords):
+    # Longitude/latitude to web mercator in [0, 1] x [0, 1], y down
+    lon = coords[:, 0]
+    lat = np.radians(np.clip(coords[:, 1], -MAX_LATITUDE, MAX_LATITUDE))
+    return np.column_stack([(lon + 180) / 360, (1 - np.arcsinh(np.tan(lat)) / math.pi) / 2])
+
+
+def polygon_parts(geometry):
+    # clip_by_rect can return lines and points along the tile edge; keep areas
+    import shapely
+    return [part for part in shapely.get_parts(geometry)
+            if isinstance(part, shapely.Polygon) and not part.is_empty]
+
+
+def zoom_tiles(names, geometries, zoom, extent=EXTENT, buffer=BUFFER):
+    # Every non-empty (x, y) tile at this zoom with its encoded bytes; shapely
+    # is only imported here, so map pages don't load it for this module
+    import shapely
+    scale = 2 ** zoom
+    margin = buffer / extent
+    tiles = {}
+    for position, (name, geometry) in enumerate(zip(names, geometries)):
+        minx, miny, maxx, maxy = geometry.bounds
+        for x in range(max(int((minx * scale) - margin), 0), min(int(maxx * scale + margin), scale - 1) + 1):
+            for y in range(max(int((miny * scale) - margin), 0), min(int(maxy * scale + margin), scale - 1) + 1):
+                clipped = shapely.clip_by_rect(geometry, (x - margin) / scale, (y - margin) / scale,
+                                               (x + 1 + margin) / scale, (y + 1 + margin) / scale)
+                if clipped.is_empty:
+                    continue
+                local = shapely.transform(clipped, lambda coords: (coords * scale - [x, y]) * extent)
+                tiles.setdefault((x, y), []).append((position, name, polygon_parts(local)))
+    return {key: encode_tile(features) for key, features in tiles.items()}
+
+
+def build_tiles(source=GEOJSON_FILE, tile_dir=TILE_DIR, zooms=TILE_ZOOMS):
+    import geopandas as gpd
+    import shapely
+    geo_data = gpd.read_file(source).to_crs("EPSG:4326")
+    names = list(geo_data['name'])
+    if os.path.exists(tile_dir):
+        shutil.rmtree(tile_dir)
+    counts = {}
+    for zoom in zooms:
+        # Same per-zoom simplification as the GeoJSON levels
+        simplified = geo_data.geometry.simplify(level_tolerance(zoom), preserve_topology=True)
+        projected = [shapely.transform(geometry, project) for geometry in simplified.values]
+        tiles = zoom_tiles(names, projected, zoom)
+        # Empty tiles are written too, so the client never requests a missing file
+        for x in range(2 ** zoom):
+            os.makedirs(os.path.join(tile_dir, str(zoom), str(x)), exist_ok=True)
+            for y in range(2 ** zoom):
+                with open(os.path.join(tile_dir, str(zoom), str(x), f"{y}.pbf"), 'wb') as f:
+                    f.write(tiles.get((x, y), b''))
+        counts[zoom] = sum(len(tile) for tile in tiles.values())
+    with open(os.path.join(tile_dir, METADATA_FILE), 'w') as f:
+        json.dump({'schema': TILE_SCHEMA, 'source_sha256': file_digest(source), 'layer': TILE_LAYER,
+                   'zooms': list(zooms), 'extent': EXTENT}, f)
+    return counts
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from services.indicator_service import INDICATORS
+from services.partition_service import YEAR_COLUMN
+
+COUNTRY_COLUMN = 'Country'
+# value, change since the previous year, trailing mean over MOVING_WINDOW years
+MEASURES = ('value', 'delta', 'moving_average')
+MOVING_WINDOW = 3
+
+
+def trend_columns(df):
+    # Every indicator's score and rank
+    columns = []
+    for indicator in INDICATORS.values():
+        columns += [column for column in (indicator.column, indicator.rank_column) if column in df]
+    return columns
+
+
+def moving_average(values, window=MOVING_WINDOW):
+    # Trailing mean along the year axis over the years that have a value
+    present = ~np.isnan(values)
+    sums = np.cumsum(np.where(present, values, 0.0), axis=1)
+    counts = np.cumsum(present, axis=1)
+    sums[:, window:] -= sums[:, :-window].copy()
+    counts[:, window:] -= counts[:, :-window].copy()
+    with np.errstate(invalid='ignore'):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+class TimeSeriesCube:
+    # Dense country x year x column x measure array built once per table, so
+    # a country's trend is a slice instead of a filter over the rows. Years
+    # run oldest first; (country, year) pairs without a row are NaN.
+
+    def __init__(self, df, columns=None):
+        self.columns = list(columns or trend_columns(df))
+        self.dtypes = {column: df[column].dtype for column in self.columns}
+        self.countries = pd.Index(pd.unique(df[COUNTRY_COLUMN].astype(str)), name=COUNTRY_COLUMN)
+        self.years = np.sort(pd.unique(df[YEAR_COLUMN].astype(int)))
+        rows = self.countries.get_indexer(df[COUNTRY_COLUMN].astype(str))
+        steps = np.searchsorted(self.years, df[YEAR_COLUMN].astype(int).to_numpy())
+
+        self.present = np.zeros((len(self.countries), len(self.years)), dtype=bool)
+        self.present[rows, steps] = True
+        values = np.full((len(self.countries), len(self.years), len(self.columns)), np.nan)
+        values[rows, steps] = df[self.columns].to_numpy(dtype=float)
+        deltas = np.full_like(values, np.nan)
+        deltas[:, 1:] = values[:, 1:] - values[:, :-1]
+        self.cube = np.stack([values, deltas, moving_average(values)], axis=-1)
+
+    @property
+    def nbytes(self):
+        return self.cube.nbytes + self.present.nbytes
+
+    def covers(self, columns):
+        return all(column in self.dtypes or column in (COUNTRY_COLUMN, YEAR_COLUMN) for column in columns)
+
+    def positions(self, countries):
+        positions = self.countries.get_indexer(pd.Index(countries, dtype=object).astype(str))
+        return positions[positions >= 0]
+
+    def frame(self, countries, columns):
+        # The table's rows for these countries, country by country and oldest
+        # year first, with the table's dtypes
+        positions = self.positions(countries)
+        rows, steps = np.nonzero(self.present[positions])
+        data = {}
+        for column in dict.fromkeys(columns):
+            if column == COUNTRY_COLUMN:
+                data[column] = self.countries[positions][rows].to_numpy()
+            elif column == YEAR_COLUMN:
+                data[column] = self.years[steps]
+            else:
+                values = self.cube[positions[rows], steps, self.columns.index(column), 0]
+                data[column] = values.astype(self.dtypes[column])
+        return pd.DataFrame(data)
+
+    def encoded_series(self, column, order, missing, scale, measure='value', years=None):
+        # One integer row per country of order with one value per year of
+        # years (every year, oldest first, by default), in column units times
+        # scale; countries or years without data get missing
+        years = self.years if years is None else np.asarray(years, dtype=int)
+        steps = np.minimum(np.searchsorted(self.years, years), len(self.years) - 1)
+        known = self.years[steps] == years
+        values = np.full((len(order), len(years)), missing, dtype='<i4')
+        found = self.countries.get_indexer(pd.Index(order))
+        series = self.cube[found[found >= 0][:, None], steps[known], self.columns.index(column),
+                           MEASURES.index(measure)]
+        values[np.ix_(found >= 0, known)] = np.where(np.isnan(series), missing, np.rint(np.round(series, 2) * scale))
+        return values
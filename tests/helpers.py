@@ -0,0 +1,29 @@
+import numpy as np
+
+from services.selection_service import add_countries, get_selection, handle_map_click
+
+# Shared by the tests and the benchmarks that replay the same workloads
+COUNTRIES = [f"Country {i}" for i in range(150)]
+
+
+def simulate_rerun(state, rng):
+    # A rerun sees the last map click again and sometimes a new multiselect pick
+    handle_map_click(rng.choice(COUNTRIES), state)
+    if rng.random() < 0.5:
+        add_countries([rng.choice(COUNTRIES)], state)
+    return get_selection(state)
+
+
+def mask_filter(df, year, region, start, end, entity_name):
+    # The previous filter_data body: full-table boolean masks per call
+    filtered_df = df.loc[(df['Year'] == year) &
+                         (df[entity_name] >= start) &
+                         (df[entity_name] <= end)]
+    if region and region != 'All':
+        filtered_df = filtered_df.loc[filtered_df['Region'] == region]
+    return filtered_df
+
+
+def scaled(df, rows):
+    # The table repeated (or cut) to the given number of rows
+    return df.iloc[np.resize(np.arange(len(df)), rows)].reset_index(drop=True)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.correlation_service import SPEARMAN_CACHE, CorrelationEngine
+from services.dataset_registry_service import DATASETS
+from services.load_data_service import prepare_dataset
+from services.snapshot_service import read_table
+
+SPEC = DATASETS['analysis']
+SELECTIONS = [((), ()), ((2019,), ()), ((), ('Western Europe',)), ((2015, 2021), ('Southern Asia', 'Western Europe'))]
+
+
+@pytest.fixture(scope='module')
+def table():
+    return read_table(columns=SPEC.columns)
+
+
+def split(df):
+    # The table as it was before its latest year was appended
+    latest = df['Year'] == df['Year'].max()
+    return df[~latest].reset_index(drop=True), df
+
+
+def test_appended_matches_full_engine(table):
+    old, new = split(table)
+    engine = CorrelationEngine(old).appended(new.iloc[len(old):])
+    full = CorrelationEngine(new)
+    for years, regions in SELECTIONS:
+        for method in ('pearson', 'spearman'):
+            np.testing.assert_allclose(engine.correlation(method, years, regions).to_numpy(),
+                                       full.correlation(method, years, regions).to_numpy(), atol=1e-9)
+
+
+def test_reload_appends_to_previous_engine(table):
+    old, new = split(table)
+    previous = prepare_dataset(old, 'old', SPEC)
+    data = prepare_dataset(new, 'new', SPEC, previous)
+    assert data.correlations.df is new
+    full = CorrelationEngine(new).pearson()
+    np.testing.assert_allclose(data.correlations.pearson().to_numpy(), full.to_numpy(), atol=1e-9)
+
+
+def test_precomputed_matrices_are_served(table):
+    engine = CorrelationEngine(table)
+    matrices = engine.precompute()
+    year = engine.years()[0]
+    assert engine.correlation('pearson') is matrices[('pearson', (), ())]
+    assert engine.correlation('pearson', [year]) is matrices[('pearson', (year,), ())]
+    assert isinstance(engine.correlation('pearson', [year], ['Western Europe']), pd.DataFrame)
+
+
+def test_spearman_cache_is_bounded_and_per_version(table, monkeypatch):
+    monkeypatch.setattr(SPEARMAN_CACHE, 'max_entries', 4)
+    engine = CorrelationEngine(table, version='v1')
+    regions = engine.regions()
+    for region in regions:
+        engine.correlation('spearman', regions=(region,))
+    assert len(SPEARMAN_CACHE) <= 4
+    expected = table[table['Region'] == regions[-1]][engine.columns].corr(method='spearman')
+    pd.testing.assert_frame_equal(engine.correlation('spearman', regions=(regions[-1],)), expected)
+    assert SPEARMAN_CACHE.evict(lambda key: 'v1' in key) > 0
@@ -0,0 +1,28 @@
+from services.instrumentation_service import Rerun, debug_sidebar, memory_rows
+from services.memory_service import MEMORY, forget_memory, memory_report, record_memory
+
+
+class Table:
+    nbytes = 3 * 2 ** 20
+
+
+def test_sidebar_renders_twice_without_changing_the_registry():
+    record_memory('test-table', 'v1', Table())
+    try:
+        for _ in range(2):
+            debug_sidebar(Rerun('test'))
+        assert MEMORY['test-table'] == {'name': 'test-table', 'version': 'v1', 'bytes': Table.nbytes}
+        row = next(row for row in memory_rows() if row['name'] == 'test-table')
+        assert row == {'name': 'test-table', 'version': 'v1', 'MB': 3.0}
+    finally:
+        forget_memory('test-table')
+
+
+def test_memory_report_returns_copies():
+    record_memory('test-table', 'v1', Table())
+    try:
+        for entry in memory_report():
+            entry.pop('bytes')
+        assert 'bytes' in MEMORY['test-table']
+    finally:
+        forget_memory('test-table')
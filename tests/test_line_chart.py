@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from graphs.chart_spec import MAX_BYTES_PER_VALUE
+from graphs.line_chart import chart_columns, line_chart_data, past_data_spec
+from services.indicator_service import INDICATORS
+from services.load_data_service import prepare_dataset, table_version
+from services.snapshot_service import read_table
+
+COUNTRIES = ['Finland', 'Denmark', 'Iceland', 'Norway', 'Switzerland', 'Netherlands', 'Sweden', 'Germany']
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return prepare_dataset(read_table(), table_version())
+
+
+def spec_rows(spec):
+    return [row for rows in spec.get('datasets', {}).values() for row in rows]
+
+
+@pytest.mark.parametrize('indicator', INDICATORS.values(), ids=list(INDICATORS))
+def test_rows_hold_only_plotted_columns(dataset, indicator):
+    tooltip = ['Country', indicator.column, indicator.rank_column]
+    long = line_chart_data(dataset.df, COUNTRIES, 'Year', indicator.column, 'Country', tooltip)
+    assert list(long.columns) == list(dict.fromkeys(chart_columns('Year', indicator.column, 'Country', tooltip)))
+    assert set(long['Country']) == set(COUNTRIES)
+    wide = line_chart_data(dataset.df, COUNTRIES, 'Year', indicator.column, 'Country', tooltip, wide=True)
+    assert set(wide.columns) == {'Year', *COUNTRIES}
+
+
+@pytest.mark.parametrize('wide', [False, True])
+@pytest.mark.parametrize('indicator', INDICATORS.values(), ids=list(INDICATORS))
+def test_spec_payload_is_bounded_by_plotted_values(dataset, indicator, wide):
+    tooltip = ['Country', indicator.column, indicator.rank_column]
+    spec = past_data_spec(dataset, COUNTRIES, 'Year', indicator.column, 'Country', tooltip,
+                          indicator.trend_title, wide)
+    rows = spec_rows(spec)
+    plotted = {'Year', 'Country', indicator.column, indicator.rank_column} | (set(COUNTRIES) if wide else set())
+    assert rows and all(set(row) <= plotted for row in rows)
+    values = sum(len(row) for row in rows)
+    assert len(json.dumps(rows)) <= MAX_BYTES_PER_VALUE * values
+
+
+def test_payload_grows_with_plotted_columns_only(dataset):
+    indicator = next(iter(INDICATORS.values()))
+    sizes = []
+    for tooltip in (['Country', indicator.column], ['Country', indicator.column, indicator.rank_column]):
+        spec = past_data_spec(dataset, COUNTRIES, 'Year', indicator.column, 'Country', tooltip,
+                              indicator.trend_title)
+        sizes.append((len(json.dumps(spec_rows(spec))), len(spec_rows(spec))))
+    (smaller, rows), (larger, _) = sizes
+    # One more tooltip column adds one value per row and nothing else
+    assert 0 < larger - smaller <= MAX_BYTES_PER_VALUE * rows
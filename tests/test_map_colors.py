@@ -0,0 +1,65 @@
+import base64
+
+import folium
+import numpy as np
+import pytest
+
+from services.comparison_service import compare_slice
+from services.filter_data_service import slice_data
+from services.geometry_service import country_order
+from services.indicator_service import INDICATORS, YEARS
+from services.layer_cache_service import build_values
+from services.load_data_service import prepare_dataset, table_version
+from services.set_scale_service import get_scale
+from services.snapshot_service import read_table
+
+REGIONS = ('All', 'Western Europe', 'Sub-Saharan Africa')
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return prepare_dataset(read_table(), table_version())
+
+
+def slices(dataset):
+    for indicator in INDICATORS.values():
+        start, end = indicator.slider_value
+        for year in YEARS:
+            for region in REGIONS:
+                df = slice_data(dataset, year, region, start, end, indicator.column)
+                if not df.empty:
+                    yield indicator, year, region, df, get_scale(dataset, year, region, start, end, indicator.column)
+
+
+def folium_fills(df, scale, indicator):
+    # Fill per country as the original folium.Choropleth colored it
+    features = [{'type': 'Feature', 'properties': {'name': country},
+                 'geometry': {'type': 'Point', 'coordinates': [0, 0]}} for country in df['Country']]
+    choropleth = folium.Choropleth(geo_data={'type': 'FeatureCollection', 'features': features}, data=df,
+                                   columns=['Country', indicator.column], key_on='feature.properties.name',
+                                   fill_color=indicator.palette, bins=scale)
+    return [choropleth.geojson.style_function(feature)['fillColor'] for feature in features]
+
+
+def legend_fills(values, countries):
+    # Fill per country from the style column and the legend colors
+    styles = np.frombuffer(base64.b64decode(values['columns']['style']), dtype=np.uint8)
+    rows = [country_order().index(country) for country in countries]
+    return [values['legend']['colors'][styles[row]] for row in rows]
+
+
+def test_fills_match_folium_choropleth(dataset):
+    order = set(country_order())
+    for indicator, year, region, df, scale in slices(dataset):
+        df = df[df['Country'].isin(order)]
+        values = build_values(df, scale, indicator)
+        assert legend_fills(values, df['Country']) == folium_fills(df, scale, indicator), \
+            (indicator.key, year, region)
+
+
+def test_comparison_styles_match_pages(dataset):
+    for indicator, year, region, df, scale in slices(dataset):
+        layer = compare_slice(dataset, year, region)[indicator.key]
+        values = build_values(df, scale, indicator)
+        for name in ('style', 'score', 'rank'):
+            assert layer['columns'][name] == values['columns'][name], (indicator.key, year, region, name)
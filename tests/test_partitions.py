@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from tests.helpers import mask_filter, scaled
+from services.dataset_service import Dataset
+from services.indicator_service import INDICATORS, YEARS
+from services.snapshot_service import read_table
+
+REGIONS = ('All', 'Western Europe', 'Sub-Saharan Africa', 'Nowhere', '')
+
+
+@pytest.fixture(scope='module')
+def table():
+    return read_table()
+
+
+def queries(df):
+    for indicator in INDICATORS.values():
+        values = df[indicator.column].dropna()
+        low, high = values.quantile([0.2, 0.8])
+        for start, end in (indicator.slider_value, (low, high), (high, low)):
+            for year in YEARS + (1990,):
+                for region in REGIONS:
+                    yield year, region, start, end, indicator.column
+
+
+@pytest.mark.parametrize('rows', [None, 20_000])
+def test_partition_query_matches_mask_filter(table, rows):
+    df = table if rows is None else scaled(table, rows)
+    partitions = Dataset(df, 'test').partitions
+    for year, region, start, end, column in queries(df):
+        expected = mask_filter(df, year, region, start, end, column)
+        result = partitions.query(year, region, column, start, end)
+        assert result.index.equals(expected.index), (year, region, start, end, column)
+
+
+def test_range_bounds_are_inclusive(table):
+    partitions = Dataset(table, 'test').partitions
+    column = INDICATORS['happiness'].column
+    values = table.loc[table['Year'] == 2019, column].to_numpy()
+    value = values[np.argsort(values)[len(values) // 2]]
+    result = partitions.query(2019, 'All', column, value, value)
+    assert (result[column] == value).all() and len(result) >= 1
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.dataset_registry_service import DATASETS
+from services.load_data_service import prepare_dataset
+from services.scale_table_service import ScaleTable, changed_rows
+from services.snapshot_service import read_table
+
+
+@pytest.fixture(scope='module')
+def table():
+    return read_table()
+
+
+def edited(df):
+    # A score edited, a row moved to another region, a row removed and one added
+    new = df.copy()
+    new.loc[new.index[3], 'Happiness Score'] += 0.5
+    new.loc[new.index[10], 'Region'] = new.loc[new.index[200], 'Region']
+    added = new.iloc[[400]].copy()
+    added['Year'] = 2014
+    return pd.concat([new.drop(new.index[50]), added], ignore_index=True)
+
+
+def assert_same_scales(result, expected):
+    assert result.scales.keys() == expected.scales.keys()
+    for key, scale in expected.scales.items():
+        np.testing.assert_allclose(result.scales[key], scale, rtol=0, atol=1e-12, err_msg=str(key))
+
+
+def test_changed_rows(table):
+    new = edited(table)
+    assert len(changed_rows(table, table)) == 0
+    # Old and new side of two edits, the removed row and the added one
+    assert len(changed_rows(table, new)) == 6
+
+
+def test_updated_matches_full_compute(table):
+    new = edited(table)
+    result = ScaleTable(table).updated(new, changed_rows(table, new))
+    assert_same_scales(result, ScaleTable(new))
+
+
+def test_reload_derives_scales_from_previous_version(table):
+    spec = DATASETS['dashboard']
+    previous = prepare_dataset(table, 'old', spec)
+    new = edited(table)
+    data = prepare_dataset(new, 'new', spec, previous)
+    assert_same_scales(data.scales, ScaleTable(new))
@@ -0,0 +1,58 @@
+import random
+import time
+import tracemalloc
+
+from tests.helpers import COUNTRIES, simulate_rerun
+from services.selection_service import (LAST_CLICK_KEY, MAX_SELECTED, SELECTION_KEY, add_countries,
+                                        get_selection, handle_map_click)
+
+RERUNS = 20000
+BATCHES = 10
+
+
+def test_selection_is_bounded():
+    rng = random.Random(0)
+    state = {}
+    for _ in range(RERUNS):
+        selection = simulate_rerun(state, rng)
+        assert len(selection) <= MAX_SELECTED
+    assert set(state) == {SELECTION_KEY, LAST_CLICK_KEY}
+    assert len(selection) == len(set(selection))
+
+
+def test_selection_cost_is_constant():
+    rng = random.Random(1)
+    state = {}
+    batch = RERUNS // BATCHES
+    timings = []
+    memory = []
+    tracemalloc.start()
+    try:
+        for _ in range(BATCHES):
+            start = time.perf_counter()
+            for _ in range(batch):
+                simulate_rerun(state, rng)
+            timings.append((time.perf_counter() - start) / batch)
+            memory.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+    # Session memory stops growing once the selection is full, and late
+    # reruns cost what early ones did (generous bound for noisy machines)
+    assert memory[-1] <= memory[0] + 16 * 1024
+    assert min(timings[-3:]) <= 3 * max(timings[:3]) + 20e-6
+
+
+def test_repeated_click_is_not_added_again():
+    state = {}
+    handle_map_click('Chile', state)
+    add_countries(['Peru'], state)
+    state[SELECTION_KEY].remove('Chile')
+    # st_folium reports the same last click on the next rerun
+    handle_map_click('Chile', state)
+    assert get_selection(state) == ['Peru']
+
+
+def test_most_recent_picks_are_kept():
+    state = {}
+    add_countries(COUNTRIES[:MAX_SELECTED + 5], state)
+    assert get_selection(state) == COUNTRIES[5:MAX_SELECTED + 5]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from services.indicator_service import HAPPINESS
+from services.snapshot_service import read_table
+from services.time_series_service import MOVING_WINDOW, TimeSeriesCube
+
+MISSING = -1
+
+
+@pytest.fixture(scope='module')
+def table():
+    return read_table()
+
+
+@pytest.fixture(scope='module')
+def cube(table):
+    return TimeSeriesCube(table)
+
+
+def expected(table, measure):
+    # The measure per country and year straight from the rows
+    scores = table.pivot_table(index='Country', columns='Year', values=HAPPINESS.column,
+                               observed=True).astype(float)
+    scores = scores.reindex(columns=sorted(table['Year'].unique()))
+    if measure == 'delta':
+        return scores.diff(axis=1)
+    if measure == 'moving_average':
+        return scores.T.rolling(MOVING_WINDOW, min_periods=1).mean().T
+    return scores
+
+
+@pytest.mark.parametrize('measure', ['value', 'delta', 'moving_average'])
+def test_encoded_series_matches_rows(table, cube, measure):
+    scores = expected(table, measure)
+    order = scores.index.astype(str).tolist() + ['Atlantis']
+    encoded = cube.encoded_series(HAPPINESS.column, order, MISSING, 100, measure)
+    want = np.where(scores.isna(), MISSING, np.rint(np.round(scores.to_numpy(), 2) * 100))
+    np.testing.assert_array_equal(encoded[:-1], want)
+    assert (encoded[-1] == MISSING).all()
+
+
+def test_encoded_series_for_some_years(cube):
+    order = cube.countries.tolist()
+    every = cube.encoded_series(HAPPINESS.column, order, MISSING, 100, 'delta')
+    year = int(cube.years[2])
+    some = cube.encoded_series(HAPPINESS.column, order, MISSING, 100, 'delta', [year, 1900])
+    np.testing.assert_array_equal(some[:, 0], every[:, 2])
+    assert (some[:, 1] == MISSING).all()
@@ -0,0 +1,318 @@
+import os
+
+import folium
+from branca.element import MacroElement
+from jinja2 import Template
+
+from services.country_index_service import MISSING_RANK, MISSING_SCORE, SCORE_SCALE
+from services.layer_cache_service import FILL_STYLE, HIGHLIGHT_STYLE, empty_values
+from services.region_service import REGION_FOCUS, REGION_ZOOM
+from services.tile_service import TILE_LAYER, TILE_URL, max_tile_zoom
+from services.instrumentation_service import instrument
+
+# DASHBOARD_MAP_DELTA=1 keeps one map mounted per page and sends each rerun
+# only the new colors, tooltip values, legend and view; it applies to the
+# tiles backend only
+DELTA_UPDATES = os.environ.get('DASHBOARD_MAP_DELTA', '') not in ('', '0')
+
+# Colors, tooltips and the legend of both layers below come from typed
+# columns (style index, score in hundredths, rank, and for the tooltip each
+# country's scores over the years, change since the previous year and
+# trailing mean) aligned with the GeoJSON feature order, which update() can
+# replace without touching the geometry.
+# Mount times (layer built and drawn) and update times are kept in
+# window.mapTimings, read by benchmarks/map_render_benchmark.py.
+CHOROPLETH_JS = """
+    function dashboardChoropleth(map, data, restyle) {
+        var state = {tip: L.tooltip({className: 'country-tooltip'})};
+        var legend = L.control({position: 'topright'});
+        legend.onAdd = function() { return L.DomUtil.create('div', 'legend'); };
+        legend.addTo(map);
+        window.mapTimings = window.mapTimings || [];
+        function decode(text, Type) {
+            var binary = atob(text);
+            var bytes = new Uint8Array(binary.length);
+            for (var i = 0; i < binary.length; i++) { bytes[i] = binary.charCodeAt(i); }
+            return new Type(bytes.buffer);
+        }
+        state.load = function(data) {
+            var columns = data.columns;
+            state.data = data;
+            state.styles = data.fills.map(function(fill) {
+                return Object.assign({fillColor: fill}, {{ this.fill_style|tojson }});
+            });
+            state.highlights = data.highlights.map(function(fill) {
+                return Object.assign({fillColor: fill}, {{ this.highlight_style|tojson }});
+            });
+            state.styleIndex = columns ? decode(columns.style, Uint8Array) : new Uint8Array(0);
+            state.scores = columns ? decode(columns.score, Int32Array) : new Int32Array(0);
+            state.ranks = columns ? decode(columns.rank, Int16Array) : new Int16Array(0);
+            state.trend = columns && columns.trend ? decode(columns.trend, Int32Array) : new Int32Array(0);
+            state.change = columns && columns.change ? decode(columns.change, Int32Array) : new Int32Array(0);
+            state.average = columns && columns.average ? decode(columns.average, Int32Array) : new Int32Array(0);
+            state.years = data.years || [];
+        };
+        state.position = function(index) {
+            return index < state.styleIndex.length ? state.styleIndex[index] : state.styles.length - 1;
+        };
+        state.style = function(index) { return state.styles[state.position(index)]; };
+        state.highlight = function(index) { return state.highlights[state.position(index)]; };
+        state.sparkline = function(index) {
+            // The country's row of the trend column as a small SVG line
+            var count = state.years.length;
+            var series = Array.prototype.slice.call(state.trend, index * count, (index + 1) * count);
+            var present = series.filter(function(value) { return value !== {{ this.missing_score }}; });
+            if (present.length < 2) { return null; }
+            var low = Math.min.apply(null, present), high = Math.max.apply(null, present);
+            var step = 80 / Math.max(count - 1, 1);
+            var points = [];
+            series.forEach(function(value, i) {
+                if (value === {{ this.missing_score }}) { return; }
+                var y = high === low ? 10 : 18 - (value - low) / (high - low) * 16;
+                points.push((i * step).toFixed(1) + ',' + y.toFixed(1));
+            });
+            return '<svg width="80" height="20"><polyline fill="none" stroke="#333" stroke-width="1.5" points="'
+                + points.join(' ') + '"/></svg>';
+        };
+        state.tooltip = function(name, index) {
+            var score = index < state.scores.length ? state.scores[index] : {{ this.missing_score }};
+            var rank = index < state.ranks.length ? state.ranks[index] : {{ this.missing_rank }};
+            var aliases = state.data.aliases;
+            var rows = [[aliases[0], name],
+                        [aliases[1], rank === {{ this.missing_rank }} ? 'N/A' : rank],
+                        [aliases[2], score === {{ this.missing_score }} ? 'N/A' : score / {{ this.score_scale }}]];
+            if (score !== {{ this.missing_score }}) {
+                [[aliases[3], state.change, '+'], [aliases[4], state.average, '']].forEach(function(extra) {
+                    var value = index < extra[1].length ? extra[1][index] : {{ this.missing_score }};
+                    if (value !== {{ this.missing_score }}) {
+                        rows.push([extra[0], (value > 0 ? extra[2] : '') + value / {{ this.score_scale }}]);
+                    }
+                });
+            }
+            var sparkline = (index + 1) * state.years.length <= state.trend.length ? state.sparkline(index) : null;
+            if (sparkline) {
+                rows.push([state.years[0] + '-' + state.years[state.years.length - 1], sparkline]);
+            }
+            return '<table>' + rows.map(function(row) {
+                return '<tr><th>' + row[0] + '</th><td>' + row[1] + '</td></tr>';
+            }).join('') + '</table>';
+        };
+        state.hover = function(name, index, latlng) {
+            map.openTooltip(state.tip.setContent(state.tooltip(name, index)), latlng);
+        };
+        state.unhover = function() { map.closeTooltip(state.tip); };
+        state.drawLegend = function() {
+            var spec = state.data.legend;
+            var div = legend.getContainer();
+            if (!spec) { div.innerHTML = ''; return; }
+            var width = 100 / spec.colors.length;
+            div.style.cssText = 'background: white; padding: 4px 8px; font: 11px arial; width: {{ this.legend_width }};';
+            div.innerHTML = '<div>' + spec.caption + '</div><div style="display: flex; height: 10px;">'
+                + spec.colors.map(function(color) {
+                    return '<span style="flex: 1; background: ' + color + ';"></span>';
+                }).join('') + '</div><div style="position: relative; height: 14px;">'
+                + spec.thresholds.map(function(threshold, i) {
+                    return '<span style="position: absolute; left: ' + (i * width) + '%; transform: translateX(-50%);">'
+                        + (+threshold).toPrecision(3) + '</span>';
+                }).join('') + '</div>';
+        };
+        state.mounted = function(started) {
+            window.mapTimings.push({mount_ms: performance.now() - started});
+        };
+        state.update = function(data) {
+            var start = performance.now();
+            state.load(data);
+            restyle();
+            state.drawLegend();
+            window.mapTimings.push({restyle_ms: performance.now() - start});
+        };
+        state.load(data);
+        state.drawLegend();
+        window.dashboardChoropleth = state;
+        return state;
+    }
+"""
+
+
+DATA_KEYS = ('columns', 'years', 'fills', 'highlights', 'aliases', 'legend')
+
+
+class Choropleth(MacroElement):
+
+    def __init__(self, layer=None):
+        super().__init__()
+        layer = layer or empty_values()
+        self.data = {key: layer[key] for key in DATA_KEYS}
+        self.missing_score = MISSING_SCORE
+        self.missing_rank = MISSING_RANK
+        self.score_scale = SCORE_SCALE
+        self.fill_style = FILL_STYLE
+        self.highlight_style = HIGHLIGHT_STYLE
+        self.legend_width = '420px'
+
+
+class TileChoropleth(Choropleth):
+    # Countries drawn from vector tiles (Leaflet.VectorGrid, which the
+    # st_folium component already loads)
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        """ + CHOROPLETH_JS + """
+        var {{ this.get_name() }} = (function(map) {
+            var started = performance.now();
+            // Names of features drawn so far, the ones a restyle has to reach
+            var drawn = {};
+            var layer = L.vectorGrid.protobuf({{ this.url|tojson }}, {
+                vectorTileLayerStyles: {
+                    {{ this.layer_name|tojson }}: function(properties) {
+                        drawn[properties.name] = true;
+                        return choropleth.style(properties.index);
+                    }
+                },
+                interactive: true,
+                maxNativeZoom: {{ this.max_zoom }},
+                getFeatureId: function(feature) { return feature.properties.name; }
+            }).addTo(map);
+            var choropleth = dashboardChoropleth(map, {{ this.data|tojson }}, function() {
+                Object.keys(drawn).forEach(function(name) { layer.resetFeatureStyle(name); });
+            });
+            // Tiles arrive asynchronously; the map is drawn once the visible ones are
+            layer.once('load', function() { choropleth.mounted(started); });
+            layer.on('mouseover', function(e) {
+                var properties = e.layer.properties;
+                layer.setFeatureStyle(properties.name, choropleth.highlight(properties.index));
+                choropleth.hover(properties.name, properties.index, e.latlng);
+            });
+            layer.on('mouseout', function(e) {
+                layer.resetFeatureStyle(e.layer.properties.name);
+                choropleth.unhover();
+            });
+            layer.on('click', function(e) {
+                // st_folium reports the clicked layer's toGeoJSON(); tile
+                // features carry their properties but no lat/lng geometry
+                var properties = e.layer.properties;
+                e.layer.toGeoJSON = function() {
+                    return {type: 'Feature', properties: properties, geometry: null};
+                };
+            });
+            return layer;
+        })({{ this._parent.get_name() }});
+        {% endmacro %}
+        """)
+
+    def __init__(self, layer=None, url=TILE_URL, layer_name=TILE_LAYER, max_zoom=None):
+        super().__init__(layer)
+        self._name = 'TileChoropleth'
+        self.url = url
+        self.layer_name = layer_name
+        self.max_zoom = max_tile_zoom() if max_zoom is None else max_zoom
+
+
+class GeoJsonChoropleth(Choropleth):
+    # Country outlines embedded once in the map, styled from the table, or
+    # taken from SharedOutlines when several maps draw the same countries
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        {% if this.outlines %}
+        var {{ this.get_name() }} = (function(map) {
+            var choropleth;
+            var features = {{ this.outlines.get_name() }};
+        {% else %}
+        """ + CHOROPLETH_JS + """
+        var {{ this.get_name() }} = (function(map) {
+            var choropleth;
+            var features = {{ this.features|tojson }};
+            // Attribute columns follow the feature order
+            features.features.forEach(function(feature, index) { feature.properties.index = index; });
+        {% endif %}
+            var started = performance.now();
+            var layer = L.geoJson(features, {
+                style: function(feature) { return choropleth.style(feature.properties.index); },
+                smoothFactor: 0
+            });
+            choropleth = dashboardChoropleth(map, {{ this.data|tojson }}, function() {
+                layer.setStyle(layer.options.style);
+            });
+            layer.addTo(map);
+            choropleth.mounted(started);
+            layer.on('mouseover', function(e) {
+                var properties = e.layer.feature.properties;
+                e.layer.setStyle(choropleth.highlight(properties.index));
+                choropleth.hover(properties.name, properties.index, e.latlng);
+            });
+            layer.on('mouseout', function(e) {
+                layer.resetStyle(e.layer);
+                choropleth.unhover();
+            });
+            return layer;
+        })({{ this._parent.get_name() }});
+        {% endmacro %}
+        """)
+
+    def __init__(self, layer=None, features=None, outlines=None):
+        super().__init__(layer)
+        self._name = 'GeoJsonChoropleth'
+        self.outlines = outlines
+        if outlines is None:
+            self.features = {'type': 'FeatureCollection', 'features': features}
+
+
+class SharedOutlines(Choropleth):
+    # The outlines and the choropleth helper, written once for a figure
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        """ + CHOROPLETH_JS + """
+        var {{ this.get_name() }} = {{ this.features|tojson }};
+        {{ this.get_name() }}.features.forEach(function(feature, index) { feature.properties.index = index; });
+        {% endmacro %}
+        """)
+
+    def __init__(self, features, legend_width='420px'):
+        super().__init__()
+        self._name = 'SharedOutlines'
+        self.features = {'type': 'FeatureCollection', 'features': features}
+        self.legend_width = legend_width
+
+
+class ChoroplethUpdate(MacroElement):
+    # Evaluated by st_folium inside the mounted map when it changes
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        window.dashboardChoropleth.update({{ this.data|tojson }});
+        {% endmacro %}
+        """)
+
+    def __init__(self, layer):
+        super().__init__()
+        self._name = 'ChoroplethUpdate'
+        self.data = {key: layer[key] for key in DATA_KEYS}
+
+
+def base_map(location, zoom):
+    map = folium.Map(location=location, zoom_start=zoom, tiles=None, scrollWheelZoom=False, max_bounds=True)
+    folium.TileLayer('CartoDB positron', name="Light Map",
+                     control=False).add_to(map)
+    return map
+
+
+@instrument('display_tile_map')
+def display_tile_map(layer, region=""):
+    map = base_map(REGION_FOCUS.get(region), REGION_ZOOM.get(region))
+    map.add_child(TileChoropleth(layer))
+    return map
+
+
+@instrument('display_live_map')
+def display_live_map(layer):
+    # The same world map on every rerun, so st_folium keeps it mounted; the
+    # values travel as its feature group, the view as its center and zoom.
+    # Geometry comes from the vector tiles, so none of it is resent
+    map = base_map(REGION_FOCUS[""], REGION_ZOOM[""])
+    map.add_child(TileChoropleth())
+    update = folium.FeatureGroup(name='values', control=False)
+    update.add_child(ChoroplethUpdate(layer))
+    return map, update
+
+
+def region_view(region):
+    # Regions without an entry (e.g. 'All') go back to the world view
+    return REGION_FOCUS.get(region, REGION_FOCUS[""]), REGION_ZOOM.get(region, REGION_ZOOM[""])
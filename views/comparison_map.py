@@ -0,0 +1,60 @@
+import math
+
+from branca.element import Figure, MacroElement
+from jinja2 import Template
+
+from services.instrumentation_service import instrument
+from views.choropleth_map import GeoJsonChoropleth, SharedOutlines, base_map, region_view
+
+COLUMNS = 2
+PANEL_HEIGHT = 320
+LEGEND_WIDTH = '240px'
+
+
+class SyncedViews(MacroElement):
+    # Panning or zooming one panel moves the others with it
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function(maps) {
+            var syncing = false;
+            maps.forEach(function(map) {
+                map.on('move', function() {
+                    if (syncing) { return; }
+                    syncing = true;
+                    maps.forEach(function(other) {
+                        if (other !== map) { other.setView(map.getCenter(), map.getZoom(), {animate: false}); }
+                    });
+                    syncing = false;
+                });
+            });
+        })([{% for map in this.maps %}{{ map.get_name() }}{% if not loop.last %}, {% endif %}{% endfor %}]);
+        {% endmacro %}
+        """)
+
+    def __init__(self, maps):
+        super().__init__()
+        self._name = 'SyncedViews'
+        self.maps = maps
+
+
+def figure_height(count):
+    return math.ceil(count / COLUMNS) * PANEL_HEIGHT
+
+
+@instrument('display_comparison')
+def display_comparison(layers, features, region=""):
+    # One small map per layer in a single document; the outlines are
+    # written once and every panel styles its own copy of them
+    rows = math.ceil(len(layers) / COLUMNS)
+    figure = Figure(height=f"{figure_height(len(layers))}px")
+    outlines = SharedOutlines(features, LEGEND_WIDTH)
+    figure.add_child(outlines)
+    location, zoom = region_view(region)
+    maps = []
+    for n, layer in enumerate(layers, 1):
+        map = base_map(location, zoom)
+        map.add_child(GeoJsonChoropleth(layer, outlines=outlines))
+        figure.add_subplot(rows, COLUMNS, n, margin=0.01).add_child(map)
+        maps.append(map)
+    figure.add_child(SyncedViews(maps))
+    return figure
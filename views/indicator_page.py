@@ -0,0 +1,102 @@
+import streamlit as st
+from streamlit_folium import st_folium
+
+from services.load_data_service import load_dataset, load_regions
+from services.indicator_service import HAPPINESS, YEARS
+from services.layer_cache_service import get_layer, get_values
+from services.region_service import REGION_FOCUS, REGION_ZOOM
+from services.filter_data_service import filter_data
+from services.selection_service import country_selector
+from services.instrumentation_service import instrument, page_run, record_payload, timed
+from services.tile_service import use_tiles
+from views.choropleth_map import (DELTA_UPDATES, GeoJsonChoropleth, base_map, display_live_map,
+                                  display_tile_map, region_view)
+
+# Charts
+from graphs.line_chart import display_past_data
+from graphs.scatter_plot import scatterplot
+
+
+def display_map(indicator, year, region, start, end, dataset):
+    df = filter_data(dataset, year, region, start, end, indicator.column)
+    if df.empty:
+        st.warning("No data available for the selected filters.")
+        return [], [], []
+
+    # Only with tiles: GeoJSON outlines would go out with every update,
+    # which then sends more than a full map
+    if DELTA_UPDATES and use_tiles():
+        st_map = display_map_update(indicator, get_values(dataset, indicator, year, region, start, end), region)
+    else:
+        if use_tiles():
+            # Geometry comes from cached vector tiles; only values are sent
+            map = display_tile_map(get_values(dataset, indicator, year, region, start, end), region)
+        else:
+            map = display_base_map(get_layer(dataset, indicator, year, region, start, end), region)
+        record_payload('map', lambda: len(map.get_root().render()))
+        with timed('st_folium'):
+            st_map = st_folium(map, width=700, height=450)
+
+    clicked = None
+    if st_map['last_active_drawing']:
+        properties = st_map['last_active_drawing']['properties']
+        clicked = properties.get('name')
+    # Map clicks and the multiselect share one per-session selection
+    select_country = country_selector(df['Country'].unique().tolist(), clicked)
+
+    selected_data = df[df['Country'].isin(select_country)]
+    ranks = selected_data[indicator.rank_column].tolist()
+    scores = selected_data[indicator.column].tolist()
+
+    return select_country, ranks, scores
+
+
+def display_map_update(indicator, layer, region):
+    map, update = display_live_map(layer)
+    center, zoom = region_view(region)
+    with timed('st_folium'):
+        # Only the map selection is returned, so panning doesn't rerun the page
+        return st_folium(map, key=f"map-{indicator.key}", width=700, height=450, feature_group_to_add=update,
+                         center=center, zoom=zoom, returned_objects=['last_active_drawing'])
+
+
+@instrument('display_base_map')
+def display_base_map(layer, region=""):
+    map = base_map(REGION_FOCUS.get(region), REGION_ZOOM.get(region))
+    # Outlines with names only; colors, scores and ranks travel as typed columns
+    map.add_child(GeoJsonChoropleth(layer, layer['features']))
+    return map
+
+
+@instrument('display_trends')
+def display_trends(indicator, dataset, countries):
+    display_past_data(dataset, countries, 'Year', indicator.column, 'Country',
+                      ['Country', indicator.column, indicator.rank_column], indicator.trend_title)
+    if indicator != HAPPINESS:
+        display_past_data(dataset, countries, 'Year', HAPPINESS.column, 'Country',
+                          ['Country', HAPPINESS.column, HAPPINESS.rank_column], HAPPINESS.trend_title)
+
+
+def render_indicator_page(indicator):
+    # Timings are only collected when DASHBOARD_INSTRUMENT is set
+    with page_run(indicator.key):
+        st.title(indicator.title)
+        with timed('load_data'):
+            dataset = load_dataset()
+            regions = load_regions()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            year = st.selectbox('Year', YEARS)
+        with col2:
+            region = st.selectbox('Region', regions)
+        with col3:
+            start, end = st.select_slider('Range',
+                                          options=indicator.slider_options,
+                                          value=indicator.slider_value)
+        if indicator.scatter:
+            scatterplot(dataset, year, region, start, end, indicator.column, HAPPINESS.column)
+        countries, ranks, scores = display_map(
+            indicator, year, region, start, end, dataset)
+
+        if countries:
+            display_trends(indicator, dataset, countries)